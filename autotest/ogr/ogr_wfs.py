@@ -12,8 +12,14 @@
 # SPDX-License-Identifier: MIT
 ###############################################################################
 
+import concurrent.futures
+import functools
+import hashlib
 import os
+import pathlib
+import urllib.parse
 from http.server import BaseHTTPRequestHandler
+from xml.etree import ElementTree
 
 import gdaltest
 import ogrtest
@@ -27,7 +33,31 @@ from osgeo import gdal, ogr, osr
 #
 
 
-pytestmark = pytest.mark.require_driver("WFS")
+# The module-scope vsimem fixtures assume in-file test order, so keep the
+# whole module together (and ordered) when running under pytest-xdist.
+pytestmark = [
+    pytest.mark.require_driver("WFS"),
+    pytest.mark.random_order(disabled=True),
+    pytest.mark.xdist_group("ogr_wfs"),
+]
+
+
+# Importing from EPSG involves PROJ database lookups, so do it only once per
+# EPSG code for the SRS comparisons done in several tests.
+@functools.lru_cache()
+def _srs_from_epsg(code):
+    srs = osr.SpatialReference()
+    srs.ImportFromEPSG(code)
+    srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+    return srs
+
+
+# Connectivity probes are answered from a per-session cache, so tests pointing
+# at the same server URL do not each re-issue the request.
+@functools.lru_cache(maxsize=32)
+def _can_reach(url):
+    return gdaltest.gdalurlopen(url) is not None
+
 
 ###############################################################################
 @pytest.fixture(autouse=True, scope="module")
@@ -46,12 +76,16 @@ def ogr_wfs_init():
     if gml_ds is None:
         pytest.skip("cannot read GML files")
 
-    vsimem_hidden_before = gdal.ReadDirRecursive("/vsimem/.#!HIDDEN!#.")
+    # Only compare entry counts: a full snapshot comparison would make the
+    # safety net needlessly expensive on large vsimem trees.
+    vsimem_hidden_before = len(gdal.ReadDirRecursive("/vsimem/.#!HIDDEN!#.") or [])
 
     with gdal.config_option("CPL_CURL_ENABLE_VSIMEM", "YES"):
         yield
 
-    assert gdal.ReadDirRecursive("/vsimem/.#!HIDDEN!#.") == vsimem_hidden_before
+    assert (
+        len(gdal.ReadDirRecursive("/vsimem/.#!HIDDEN!#.") or []) == vsimem_hidden_before
+    )
 
 
 @pytest.fixture(
@@ -69,7 +103,7 @@ def with_and_without_streaming(request):
 @pytest.mark.skip()
 def test_ogr_wfs_mapserver():
 
-    if gdaltest.gdalurlopen("http://www2.dmsolutions.ca/cgi-bin/mswfs_gmap") is None:
+    if not _can_reach("http://www2.dmsolutions.ca/cgi-bin/mswfs_gmap"):
         pytest.skip("cannot open URL")
 
     ds = ogr.Open("WFS:http://www2.dmsolutions.ca/cgi-bin/mswfs_gmap")
@@ -82,8 +116,7 @@ def test_ogr_wfs_mapserver():
     assert lyr.GetName() == "park", "did not get expected layer name"
 
     sr = lyr.GetSpatialRef()
-    sr2 = osr.SpatialReference()
-    sr2.ImportFromEPSG(42304)
+    sr2 = _srs_from_epsg(42304)
     assert sr.IsSame(sr2), "did not get expected SRS"
 
     feat_count = lyr.GetFeatureCount()
@@ -104,11 +137,8 @@ def test_ogr_wfs_mapserver():
 @pytest.mark.skip("FIXME: re-enable after adapting test")
 def test_ogr_wfs_geoserver():
 
-    if (
-        gdaltest.gdalurlopen(
-            "http://demo.opengeo.org/geoserver/wfs?TYPENAME=za:za_points&SERVICE=WFS&VERSION=1.1.0&REQUEST=DescribeFeatureType"
-        )
-        is None
+    if not _can_reach(
+        "http://demo.opengeo.org/geoserver/wfs?TYPENAME=za:za_points&SERVICE=WFS&VERSION=1.1.0&REQUEST=DescribeFeatureType"
     ):
         gdaltest.geoserver_wfs = False
         pytest.skip("cannot open URL")
@@ -123,8 +153,7 @@ def test_ogr_wfs_geoserver():
     assert lyr.GetName() == "za:za_points", "did not get expected layer name"
 
     sr = lyr.GetSpatialRef()
-    sr2 = osr.SpatialReference()
-    sr2.ImportFromEPSG(4326)
+    sr2 = _srs_from_epsg(4326)
     assert sr.IsSame(sr2), "did not get expected SRS"
 
     feat_count = lyr.GetFeatureCount()
@@ -295,7 +324,7 @@ def test_ogr_wfs_geoserver_paging():
 
     # Test with WFS 1.0.0
     with gdal.config_options(
-        {"OGR_WFS_PAGING_ALLOWED": "ON", "OGR_WFS_PAGE_SIZE": "%d" % page_size}
+        {"OGR_WFS_PAGING_ALLOWED": "ON", "OGR_WFS_PAGE_SIZE": f"{page_size}"}
     ):
         ds = ogr.Open(
             "WFS:http://demo.opengeo.org/geoserver/wfs?TYPENAME=og:bugsites&VERSION=1.0.0"
@@ -310,7 +339,7 @@ def test_ogr_wfs_geoserver_paging():
 
     # Test with WFS 1.1.0
     with gdal.config_options(
-        {"OGR_WFS_PAGING_ALLOWED": "ON", "OGR_WFS_PAGE_SIZE": "%d" % page_size}
+        {"OGR_WFS_PAGING_ALLOWED": "ON", "OGR_WFS_PAGE_SIZE": f"{page_size}"}
     ):
         ds = ogr.Open(
             "WFS:http://demo.opengeo.org/geoserver/wfs?TYPENAME=og:bugsites&VERSION=1.1.0"
@@ -320,12 +349,8 @@ def test_ogr_wfs_geoserver_paging():
     lyr = ds.GetLayer(0)
     feature_count_wfs110 = lyr.GetFeatureCount()
 
-    feature_count_wfs110_at_hand = 0
     lyr.ResetReading()
-    feat = lyr.GetNextFeature()
-    while feat is not None:
-        feature_count_wfs110_at_hand = feature_count_wfs110_at_hand + 1
-        feat = lyr.GetNextFeature()
+    feature_count_wfs110_at_hand = sum(1 for _ in lyr)
     ds = None
 
     assert feature_count_wfs110 == feature_count_ref, feature_count_wfs100
@@ -340,7 +365,7 @@ def test_ogr_wfs_geoserver_paging():
 @pytest.mark.skip()
 def test_ogr_wfs_deegree():
 
-    if gdaltest.gdalurlopen("http://demo.deegree.org:80/utah-workspace") is None:
+    if not _can_reach("http://demo.deegree.org:80/utah-workspace"):
         gdaltest.deegree_wfs = False
         pytest.skip("cannot open URL")
     gdaltest.deegree_wfs = True
@@ -358,8 +383,7 @@ def test_ogr_wfs_deegree():
     assert lyr.GetName() == "app:SGID024_Springs", "did not get expected layer name"
 
     sr = lyr.GetSpatialRef()
-    sr2 = osr.SpatialReference()
-    sr2.ImportFromEPSG(26912)
+    sr2 = _srs_from_epsg(26912)
     assert sr.IsSame(sr2), "did not get expected SRS"
 
     feat = lyr.GetNextFeature()
@@ -420,64 +444,138 @@ def test_ogr_wfs_test_ogrsf():
 ###############################################################################
 do_log = False
 
+# Canned responses served by WFSHTTPHandler, read once at import time rather
+# than from disk on every request. Resolved against this file since the
+# current directory is only guaranteed to be the test directory at run time.
+_wfs_data_dir = pathlib.Path(__file__).parent / "data" / "wfs"
+
+_wfs_fixtures = {
+    name: (_wfs_data_dir / name).read_bytes()
+    for name in (
+        "get_capabilities.xml",
+        "describe_feature_type.xml",
+        "get_feature.xml",
+    )
+}
 
-class WFSHTTPHandler(BaseHTTPRequestHandler):
-    def log_request(self, code="-", size="-"):
-        pass
 
-    def do_GET(self):
+# Larger XML payloads shared by several tests live in data/wfs/ and are read
+# (and cached) on first use rather than embedded as multi-KB literals.
+@functools.lru_cache()
+def _xml(name):
+    return (_wfs_data_dir / name).read_text()
 
-        try:
-            if do_log:
-                f = open("/tmp/log.txt", "a")
-                f.write("GET %s\n" % self.path)
-                f.close()
 
-            if self.path.find("/fakewfs") != -1:
+# Template for the small GetFeature responses of the WFS 1.1.0 vsimem
+# endpoint, so each test only spells out the feature members it cares about
+# instead of repeating the whole FeatureCollection header.
+def make_feature_xml(members="", number_of_features=1):
+    return """<wfs:FeatureCollection xmlns:xs="http://www.w3.org/2001/XMLSchema"
+xmlns:ogc="http://www.opengis.net/ogc"
+xmlns:foo="http://foo"
+xmlns:wfs="http://www.opengis.net/wfs"
+xmlns:ows="http://www.opengis.net/ows"
+xmlns:xlink="http://www.w3.org/1999/xlink"
+xmlns:gml="http://www.opengis.net/gml"
+xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+numberOfFeatures="%d"
+timeStamp="2015-04-17T14:14:24.859Z"
+xsi:schemaLocation="http://foo /vsimem/wfs_endpoint?SERVICE=WFS&amp;VERSION=1.1.0&amp;REQUEST=DescribeFeatureType&amp;TYPENAME=my_layer
+                    http://www.opengis.net/wfs http://schemas.opengis.net/wfs/1.1.0/wfs.xsd">
+%s</wfs:FeatureCollection>
+""" % (
+        number_of_features,
+        members,
+    )
 
-                if (
-                    self.path == "/fakewfs?SERVICE=WFS&REQUEST=GetCapabilities"
-                    or self.path
-                    == "/fakewfs?SERVICE=WFS&REQUEST=GetCapabilities&ACCEPTVERSIONS=1.1.0,1.0.0"
-                ):
-                    self.send_response(200)
-                    self.send_header("Content-type", "application/xml")
-                    self.end_headers()
-                    f = open("data/wfs/get_capabilities.xml", "rb")
-                    content = f.read()
-                    f.close()
-                    self.wfile.write(content)
-                    return
 
-                if (
-                    self.path
-                    == "/fakewfs?SERVICE=WFS&VERSION=1.1.0&REQUEST=DescribeFeatureType&TYPENAME=rijkswegen"
-                ):
-                    self.send_response(200)
-                    self.send_header("Content-type", "application/xml")
-                    self.end_headers()
-                    f = open("data/wfs/describe_feature_type.xml", "rb")
-                    content = f.read()
-                    f.close()
-                    self.wfile.write(content)
-                    return
+def _urlescape(s):
+    # Encode a FILTER value exactly like CPLEscapeURL() does on the driver
+    # side (':' and ',' kept literal, '-' percent-encoded, uppercase hex),
+    # so the vsimem fake-HTTP URLs can be registered from the readable XML
+    # instead of hand-maintained percent-encoded strings.
+    return urllib.parse.quote(s, safe=":,").replace("-", "%2D")
 
-                if (
-                    self.path
-                    == "/fakewfs?SERVICE=WFS&VERSION=1.1.0&REQUEST=GetFeature&TYPENAME=rijkswegen"
-                ):
-                    self.send_response(200)
-                    self.send_header("Content-type", "application/xml")
-                    self.end_headers()
-                    f = open("data/wfs/get_feature.xml", "rb")
-                    content = f.read()
-                    f.close()
-                    self.wfile.write(content)
-                    return
 
+# Same idea for the WFS 2.0 paging endpoint: the page responses only differ
+# by their counts and feature members, so fill one template per page.
+def make_wfs200_page_xml(
+    number_matched, number_returned, members="", dft_version="1.1.0"
+):
+    return """<wfs:FeatureCollection xmlns:xs="http://www.w3.org/2001/XMLSchema"
+xmlns:ogc="http://www.opengis.net/ogc"
+xmlns:foo="http://foo"
+xmlns:wfs="http://www.opengis.net/wfs"
+xmlns:ows="http://www.opengis.net/ows"
+xmlns:xlink="http://www.w3.org/1999/xlink"
+xmlns:gml="http://www.opengis.net/gml"
+xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+numberMatched="%s" numberReturned="%d"
+timeStamp="2015-04-17T14:14:24.859Z"
+xsi:schemaLocation="http://foo /vsimem/wfs_endpoint?SERVICE=WFS&amp;VERSION=%s&amp;REQUEST=DescribeFeatureType&amp;TYPENAME=my_layer
+                    http://www.opengis.net/wfs/2.0 http://schemas.opengis.net/wfs/2.0/wfs.xsd">
+%s</wfs:FeatureCollection>
+""" % (
+        number_matched,
+        number_returned,
+        dft_version,
+        members,
+    )
+
+
+def _vsi_read_all(path):
+    # Stat first so the read buffer is allocated at the exact file size,
+    # rather than a fixed oversized one.
+    st = gdal.VSIStatL(path)
+    f = gdal.VSIFOpenL(path, "rb")
+    try:
+        return gdal.VSIFReadL(1, int(st.size), f)
+    finally:
+        gdal.VSIFCloseL(f)
+
+
+def _assert_same_xml(got, expected_name):
+    # Compare canonical forms, so the check is one pass over each tree and
+    # does not depend on the exact whitespace emitted by the serializer.
+    assert ElementTree.canonicalize(got, strip_text=True) == ElementTree.canonicalize(
+        _xml(expected_name), strip_text=True
+    )
+
+
+# Complete HTTP responses (status line, headers and body), so each request
+# is served with a single wfile.write() rather than one send per header.
+_wfs_responses = {
+    name: b"HTTP/1.0 200 OK\r\nContent-type: application/xml\r\nContent-Length: %d\r\n\r\n"
+    % len(body)
+    + body
+    for name, body in _wfs_fixtures.items()
+}
+
+# Exact request path -> fixture served, so that do_GET is a single dict
+# lookup instead of a chain of string comparisons.
+_wfs_routes = {
+    "/fakewfs?SERVICE=WFS&REQUEST=GetCapabilities": "get_capabilities.xml",
+    "/fakewfs?SERVICE=WFS&REQUEST=GetCapabilities&ACCEPTVERSIONS=1.1.0,1.0.0": "get_capabilities.xml",
+    "/fakewfs?SERVICE=WFS&VERSION=1.1.0&REQUEST=DescribeFeatureType&TYPENAME=rijkswegen": "describe_feature_type.xml",
+    "/fakewfs?SERVICE=WFS&VERSION=1.1.0&REQUEST=GetFeature&TYPENAME=rijkswegen": "get_feature.xml",
+}
+
+
+class WFSHTTPHandler(BaseHTTPRequestHandler):
+    def log_request(self, code="-", size="-"):
+        pass
+
+    def do_GET(self):
+
+        if do_log:
+            f = open("/tmp/log.txt", "a")
+            f.write("GET %s\n" % self.path)
+            f.close()
+
+        fixture = _wfs_routes.get(self.path)
+        if fixture is not None:
+            self.wfile.write(_wfs_responses[fixture])
             return
-        except IOError:
-            pass
 
         self.send_error(404, "File Not Found: %s" % self.path)
 
@@ -486,40 +584,46 @@ class WFSHTTPHandler(BaseHTTPRequestHandler):
 # Test reading a local fake WFS server
 
 
-@gdaltest.enable_exceptions()
-@pytest.mark.parametrize("using_wfs_prefix", [True, False])
-def test_ogr_wfs_fake_wfs_server(using_wfs_prefix):
+@pytest.fixture(scope="module")
+def fake_wfs_server():
 
     (process, port) = webserver.launch(handler=WFSHTTPHandler)
     if port == 0:
         pytest.skip()
 
-    try:
-        with gdal.config_option("OGR_WFS_LOAD_MULTIPLE_LAYER_DEFN", "NO"):
-            if using_wfs_prefix:
-                ds = gdal.OpenEx("WFS:http://127.0.0.1:%d/fakewfs" % port)
-            else:
-                ds = gdal.OpenEx(
-                    "http://127.0.0.1:%d/fakewfs" % port, allowed_drivers=["WFS"]
-                )
+    yield port
 
-        lyr = ds.GetLayerByName("rijkswegen")
-        assert lyr.GetName() == "rijkswegen"
+    webserver.server_stop(process, port)
 
-        sr = lyr.GetSpatialRef()
-        sr2 = osr.SpatialReference()
-        sr2.ImportFromEPSG(28992)
-        assert sr.IsSame(sr2), sr
 
-        feat = lyr.GetNextFeature()
-        assert feat.GetField("MPLength") == "33513."
-        ogrtest.check_feature_geometry(
-            feat,
-            "MULTICURVE ((154898.65286 568054.62753,160108.36082 566076.78094,164239.254332 563024.70188,170523.31535 561231.219583,172676.42256 559253.37299,175912.80562 557459.89069,180043.699132 553508.779495,183294.491306 552250.182732))",
-            max_error=0.00001,
-        )
-    finally:
-        webserver.server_stop(process, port)
+@gdaltest.enable_exceptions()
+@pytest.mark.parametrize("using_wfs_prefix", [True, False])
+def test_ogr_wfs_fake_wfs_server(fake_wfs_server, using_wfs_prefix):
+
+    port = fake_wfs_server
+
+    with gdal.config_option("OGR_WFS_LOAD_MULTIPLE_LAYER_DEFN", "NO"):
+        if using_wfs_prefix:
+            ds = gdal.OpenEx(f"WFS:http://127.0.0.1:{port}/fakewfs")
+        else:
+            ds = gdal.OpenEx(
+                f"http://127.0.0.1:{port}/fakewfs", allowed_drivers=["WFS"]
+            )
+
+    lyr = ds.GetLayerByName("rijkswegen")
+    assert lyr.GetName() == "rijkswegen"
+
+    sr = lyr.GetSpatialRef()
+    sr2 = _srs_from_epsg(28992)
+    assert sr.IsSame(sr2), sr
+
+    feat = lyr.GetNextFeature()
+    assert feat.GetField("MPLength") == "33513."
+    ogrtest.check_feature_geometry(
+        feat,
+        "MULTICURVE ((154898.65286 568054.62753,160108.36082 566076.78094,164239.254332 563024.70188,170523.31535 561231.219583,172676.42256 559253.37299,175912.80562 557459.89069,180043.699132 553508.779495,183294.491306 552250.182732))",
+        max_error=0.00001,
+    )
 
 
 ###############################################################################
@@ -606,7 +710,7 @@ def test_ogr_wfs_geoserver_wfst():
 @pytest.mark.skip()
 def test_ogr_wfs_deegree_wfst():
 
-    if gdaltest.gdalurlopen("http://testing.deegree.org/deegree-wfs/services") is None:
+    if not _can_reach("http://testing.deegree.org/deegree-wfs/services"):
         pytest.skip("cannot open URL")
 
     ds = ogr.Open("WFS:http://testing.deegree.org/deegree-wfs/services", update=1)
@@ -644,10 +748,7 @@ def test_ogr_wfs_deegree_wfst():
 @pytest.mark.skip()
 def test_ogr_wfs_ionic_wfst():
 
-    if (
-        gdaltest.gdalurlopen("http://webservices.ionicsoft.com/ionicweb/wfs/BOSTON_ORA")
-        is None
-    ):
+    if not _can_reach("http://webservices.ionicsoft.com/ionicweb/wfs/BOSTON_ORA"):
         gdaltest.ionic_wfs = False
         pytest.skip("cannot open URL")
     gdaltest.ionic_wfs = True
@@ -792,15 +893,12 @@ def test_ogr_wfs_xmldescriptionfile_to_be_updated():
 
 def test_ogr_wfs_getcapabilitiesfile():
 
-    ds = ogr.Open("data/wfs/getcapabilities_wfs.xml")
-
-    if ds is None:
+    try:
+        ds = ogr.Open("data/wfs/getcapabilities_wfs.xml")
+        assert ds is not None
+        ds = None
+    finally:
         gdal.Unlink("data/wfs/getcapabilities_wfs.gfs")
-        pytest.fail()
-
-    ds = None
-
-    gdal.Unlink("data/wfs/getcapabilities_wfs.gfs")
 
 
 ###############################################################################
@@ -814,11 +912,8 @@ def test_ogr_wfs_deegree_gml321():
         "WFS:http://demo.deegree.org:80/inspire-workspace/services/wfs?ACCEPTVERSIONS=1.1.0&MAXFEATURES=10"
     )
     if ds is None:
-        if (
-            gdaltest.gdalurlopen(
-                "http://demo.deegree.org:80/inspire-workspace/services/wfs?ACCEPTVERSIONS=1.1.0"
-            )
-            is None
+        if not _can_reach(
+            "http://demo.deegree.org:80/inspire-workspace/services/wfs?ACCEPTVERSIONS=1.1.0"
         ):
             pytest.skip("cannot open URL")
         if (
@@ -847,11 +942,8 @@ def test_ogr_wfs_deegree_wfs200():
         "WFS:http://demo.deegree.org:80/utah-workspace/services/wfs?ACCEPTVERSIONS=2.0.0"
     )
     if ds is None:
-        if (
-            gdaltest.gdalurlopen(
-                "http://demo.deegree.org:80/utah-workspace/services/wfs?ACCEPTVERSIONS=2.0.0"
-            )
-            is None
+        if not _can_reach(
+            "http://demo.deegree.org:80/utah-workspace/services/wfs?ACCEPTVERSIONS=2.0.0"
         ):
             pytest.skip("cannot open URL")
         pytest.fail()
@@ -904,12 +996,7 @@ def test_ogr_wfs_deegree_sortby():
         "WFS:http://demo.deegree.org:80/utah-workspace/services/wfs?MAXFEATURES=10&VERSION=1.1.0"
     )
     if ds is None:
-        if (
-            gdaltest.gdalurlopen(
-                "http://demo.deegree.org:80/utah-workspace/services/wfs"
-            )
-            is None
-        ):
+        if not _can_reach("http://demo.deegree.org:80/utah-workspace/services/wfs"):
             pytest.skip("cannot open URL")
         pytest.fail()
 
@@ -933,11 +1020,52 @@ def test_ogr_wfs_deegree_sortby():
 ###############################################################################
 
 
+# Remote servers exercised by the slow multi-layer-defn tests below.
+_remote_wfs_urls = {
+    "esri_2": "http://sentinel.ga.gov.au/wfsconnector/com.esri.wfs.Esrimap",
+    "cubewerx": "http://portal.cubewerx.com/cubewerx/cubeserv/cubeserv.cgi?CONFIG=haiti_vgi&DATASTORE=vgi",
+    "tinyows": "http://www.tinyows.org/cgi-bin/tinyows",
+    "erdas_apollo": "http://apollo.erdas.com/erdas-apollo/vector/Cherokee",
+    "intergraph": "http://ideg.xunta.es/WFS_POL/request.aspx",
+    "mapinfo": "http://www.mapinfo.com/miwfs",
+}
+
+
+def _download_caps(url):
+    # Fetch (or find in tmp/cache) the GetCapabilities response of a remote
+    # server, and return the name of the cache file on success.
+    caps_url = (
+        url + ("&" if "?" in url else "?") + "SERVICE=WFS&REQUEST=GetCapabilities"
+    )
+    caps_file = "wfs_caps_" + hashlib.sha1(url.encode("utf-8")).hexdigest() + ".xml"
+    if gdaltest.download_file(caps_url, caps_file):
+        return caps_file
+    return None
+
+
+@pytest.fixture(scope="module")
+def prefetched_remote_caps():
+    # Warm the GetCapabilities cache of all remote servers in one parallel
+    # pass, so the slow tests wait for the slowest server rather than for the
+    # sum of all of them.
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=len(_remote_wfs_urls)
+    ) as executor:
+        list(executor.map(_download_caps, _remote_wfs_urls.values()))
+
+
 def ogr_wfs_get_multiple_layer_defn(url):
 
-    ds = ogr.Open("WFS:" + url)
+    # Replay the GetCapabilities response from the tmp/cache download cache
+    # when available, so re-runs of these slow tests do not pay the initial
+    # network round trip again.
+    caps_file = _download_caps(url)
+    if caps_file:
+        ds = ogr.Open("tmp/cache/" + caps_file)
+    else:
+        ds = ogr.Open("WFS:" + url)
     if ds is None:
-        if gdaltest.gdalurlopen(url) is None:
+        if not _can_reach(url):
             pytest.skip("cannot open URL")
         pytest.fail()
 
@@ -966,10 +1094,8 @@ def test_ogr_wfs_esri():
 
 
 @pytest.mark.slow()
-def test_ogr_wfs_esri_2():
-    return ogr_wfs_get_multiple_layer_defn(
-        "http://sentinel.ga.gov.au/wfsconnector/com.esri.wfs.Esrimap"
-    )
+def test_ogr_wfs_esri_2(prefetched_remote_caps):
+    return ogr_wfs_get_multiple_layer_defn(_remote_wfs_urls["esri_2"])
 
 
 ###############################################################################
@@ -977,10 +1103,8 @@ def test_ogr_wfs_esri_2():
 
 
 @pytest.mark.slow()
-def test_ogr_wfs_cubewerx():
-    return ogr_wfs_get_multiple_layer_defn(
-        "http://portal.cubewerx.com/cubewerx/cubeserv/cubeserv.cgi?CONFIG=haiti_vgi&DATASTORE=vgi"
-    )
+def test_ogr_wfs_cubewerx(prefetched_remote_caps):
+    return ogr_wfs_get_multiple_layer_defn(_remote_wfs_urls["cubewerx"])
 
 
 ###############################################################################
@@ -988,8 +1112,8 @@ def test_ogr_wfs_cubewerx():
 
 
 @pytest.mark.slow()
-def test_ogr_wfs_tinyows():
-    return ogr_wfs_get_multiple_layer_defn("http://www.tinyows.org/cgi-bin/tinyows")
+def test_ogr_wfs_tinyows(prefetched_remote_caps):
+    return ogr_wfs_get_multiple_layer_defn(_remote_wfs_urls["tinyows"])
 
 
 ###############################################################################
@@ -997,10 +1121,8 @@ def test_ogr_wfs_tinyows():
 
 
 @pytest.mark.slow()
-def test_ogr_wfs_erdas_apollo():
-    return ogr_wfs_get_multiple_layer_defn(
-        "http://apollo.erdas.com/erdas-apollo/vector/Cherokee"
-    )
+def test_ogr_wfs_erdas_apollo(prefetched_remote_caps):
+    return ogr_wfs_get_multiple_layer_defn(_remote_wfs_urls["erdas_apollo"])
 
 
 ###############################################################################
@@ -1008,8 +1130,8 @@ def test_ogr_wfs_erdas_apollo():
 
 
 @pytest.mark.slow()
-def test_ogr_wfs_intergraph():
-    return ogr_wfs_get_multiple_layer_defn("http://ideg.xunta.es/WFS_POL/request.aspx")
+def test_ogr_wfs_intergraph(prefetched_remote_caps):
+    return ogr_wfs_get_multiple_layer_defn(_remote_wfs_urls["intergraph"])
 
 
 ###############################################################################
@@ -1017,8 +1139,8 @@ def test_ogr_wfs_intergraph():
 
 
 @pytest.mark.slow()
-def test_ogr_wfs_mapinfo():
-    return ogr_wfs_get_multiple_layer_defn("http://www.mapinfo.com/miwfs")
+def test_ogr_wfs_mapinfo(prefetched_remote_caps):
+    return ogr_wfs_get_multiple_layer_defn(_remote_wfs_urls["mapinfo"])
 
 
 ###############################################################################
@@ -1042,72 +1164,43 @@ def test_ogr_wfs_vsimem_fail_because_no_get_capabilities():
 ###############################################################################
 
 
-def test_ogr_wfs_vsimem_fail_because_empty_response():
-
-    with gdaltest.tempfile(
-        "/vsimem/wfs_endpoint?SERVICE=WFS&REQUEST=GetCapabilities", ""
-    ), gdaltest.error_handler():
-        ds = ogr.Open("WFS:/vsimem/wfs_endpoint")
-    assert ds is None
-    assert "Empty content returned by server" in gdal.GetLastErrorMsg()
-
-
-###############################################################################
-
-
-def test_ogr_wfs_vsimem_fail_because_no_WFS_Capabilities():
-
-    with gdaltest.tempfile(
-        "/vsimem/wfs_endpoint?SERVICE=WFS&REQUEST=GetCapabilities", "<foo/>"
-    ), gdaltest.error_handler():
-        ds = ogr.Open("WFS:/vsimem/wfs_endpoint")
-    assert ds is None
-    assert "Cannot find <WFS_Capabilities>" in gdal.GetLastErrorMsg()
-
-
-###############################################################################
-
-
-def test_ogr_wfs_vsimem_fail_because_exception():
-
-    with gdaltest.tempfile(
-        "/vsimem/wfs_endpoint?SERVICE=WFS&REQUEST=GetCapabilities",
-        "<ServiceExceptionReport/>",
-    ), gdaltest.error_handler():
-        ds = ogr.Open("WFS:/vsimem/wfs_endpoint")
-    assert ds is None
-    assert (
-        "Error returned by server : <ServiceExceptionReport/>" in gdal.GetLastErrorMsg()
-    )
-
-
-###############################################################################
-
-
-def test_ogr_wfs_vsimem_fail_because_invalid_xml_capabilities():
-
-    with gdaltest.tempfile(
-        "/vsimem/wfs_endpoint?SERVICE=WFS&REQUEST=GetCapabilities", "<invalid_xml"
-    ), gdaltest.error_handler():
-        ds = ogr.Open("WFS:/vsimem/wfs_endpoint")
-    assert ds is None
-    assert "Invalid XML content : <invalid_xml" in gdal.GetLastErrorMsg()
-
-
-###############################################################################
-
-
-def test_ogr_wfs_vsimem_fail_because_missing_featuretypelist():
+@pytest.mark.parametrize(
+    "content,expected_error",
+    [
+        pytest.param(
+            "",
+            "Empty content returned by server",
+            id="empty_response",
+        ),
+        pytest.param(
+            "<foo/>",
+            "Cannot find <WFS_Capabilities>",
+            id="no_WFS_Capabilities",
+        ),
+        pytest.param(
+            "<ServiceExceptionReport/>",
+            "Error returned by server : <ServiceExceptionReport/>",
+            id="exception",
+        ),
+        pytest.param(
+            "<invalid_xml",
+            "Invalid XML content : <invalid_xml",
+            id="invalid_xml_capabilities",
+        ),
+        pytest.param(
+            "<WFS_Capabilities>\n</WFS_Capabilities>\n",
+            "Cannot find <FeatureTypeList>",
+            id="missing_featuretypelist",
+        ),
+    ],
+)
+def test_ogr_wfs_vsimem_fail_because_invalid_capabilities(content, expected_error):
 
     with gdaltest.tempfile(
-        "/vsimem/wfs_endpoint?SERVICE=WFS&REQUEST=GetCapabilities",
-        """<WFS_Capabilities>
-</WFS_Capabilities>
-""",
-    ), gdaltest.error_handler():
+        "/vsimem/wfs_endpoint?SERVICE=WFS&REQUEST=GetCapabilities", content
+    ), gdaltest.error_raised(gdal.CE_Failure, expected_error):
         ds = ogr.Open("WFS:/vsimem/wfs_endpoint")
     assert ds is None
-    assert "Cannot find <FeatureTypeList>" in gdal.GetLastErrorMsg()
 
 
 ###############################################################################
@@ -1210,13 +1303,8 @@ def test_ogr_wfs_vsimem_wfs110_minimal_instance():
 ###############################################################################
 
 
-@pytest.fixture()
-def wfs110_onelayer_get_caps():
-
-    # Invalid response, but enough for use
-    with gdaltest.tempfile(
-        "/vsimem/wfs_endpoint?SERVICE=WFS&REQUEST=GetCapabilities",
-        """<WFS_Capabilities version="1.1.0">
+# Invalid response, but enough for use
+_CAPS_XML = """<WFS_Capabilities version="1.1.0">
     <FeatureTypeList>
         <FeatureType/>
         <FeatureType>
@@ -1224,7 +1312,17 @@ def wfs110_onelayer_get_caps():
         </FeatureType>
     </FeatureTypeList>
 </WFS_Capabilities>
-""",
+"""
+
+
+# The capabilities are static, so install them once for all the tests that
+# share them rather than re-writing and re-parsing them per test.
+@pytest.fixture(scope="module")
+def wfs110_onelayer_get_caps():
+
+    with gdaltest.tempfile(
+        "/vsimem/wfs_endpoint?SERVICE=WFS&REQUEST=GetCapabilities",
+        _CAPS_XML,
     ):
         yield
 
@@ -1299,31 +1397,11 @@ def test_ogr_wfs_vsimem_wfs110_one_layer_describefeaturetype_missing_schema(
 ###############################################################################
 
 
-@pytest.fixture()
+@pytest.fixture(scope="module")
 def wfs110_onelayer_describefeaturetype():
     with gdaltest.tempfile(
         "/vsimem/wfs_endpoint?SERVICE=WFS&VERSION=1.1.0&REQUEST=DescribeFeatureType&TYPENAME=my_layer",
-        """<xsd:schema xmlns:foo="http://foo" xmlns:gml="http://www.opengis.net/gml" xmlns:xsd="http://www.w3.org/2001/XMLSchema" elementFormDefault="qualified" targetNamespace="http://foo">
-  <xsd:import namespace="http://www.opengis.net/gml" schemaLocation="http://foo/schemas/gml/3.1.1/base/gml.xsd"/>
-  <xsd:complexType name="my_layerType">
-    <xsd:complexContent>
-      <xsd:extension base="gml:AbstractFeatureType">
-        <xsd:sequence>
-          <xsd:element maxOccurs="1" minOccurs="0" name="str" nillable="true" type="xsd:string"/>
-          <xsd:element maxOccurs="1" minOccurs="0" name="boolean" nillable="true" type="xsd:boolean"/>
-          <xsd:element maxOccurs="1" minOccurs="0" name="short" nillable="true" type="xsd:short"/>
-          <xsd:element maxOccurs="1" minOccurs="0" name="int" nillable="true" type="xsd:int"/>
-          <xsd:element maxOccurs="1" minOccurs="0" name="float" nillable="true" type="xsd:float"/>
-          <xsd:element maxOccurs="1" minOccurs="0" name="double" nillable="true" type="xsd:double"/>
-          <xsd:element maxOccurs="1" minOccurs="0" name="dt" nillable="true" type="xsd:dateTime"/>
-          <xsd:element maxOccurs="1" minOccurs="0" name="shape" nillable="true" type="gml:PointPropertyType"/>
-        </xsd:sequence>
-      </xsd:extension>
-    </xsd:complexContent>
-  </xsd:complexType>
-  <xsd:element name="my_layer" substitutionGroup="gml:_Feature" type="foo:my_layerType"/>
-</xsd:schema>
-""",
+        _xml("describe_feature_type_my_layer.xml"),
     ):
         yield
 
@@ -1383,70 +1461,20 @@ def test_ogr_wfs_vsimem_wfs110_one_layer_xmldescriptionfile_to_be_updated(
         assert lyr.GetName() == "my_layer"
         ds = None
 
-        f = gdal.VSIFOpenL("/vsimem/ogr_wfs_xmldescriptionfile_to_be_updated.xml", "rb")
-        data = gdal.VSIFReadL(1, 100000, f).decode("ascii")
-        gdal.VSIFCloseL(f)
-        assert (
-            data
-            == """<OGRWFSDataSource>
-  <URL>/vsimem/wfs_endpoint</URL>
-  <WFS_Capabilities version="1.1.0">
-    <FeatureTypeList>
-      <FeatureType />
-      <FeatureType>
-        <Name>my_layer</Name>
-      </FeatureType>
-    </FeatureTypeList>
-  </WFS_Capabilities>
-</OGRWFSDataSource>
-"""
-        )
+        data = _vsi_read_all(
+            "/vsimem/ogr_wfs_xmldescriptionfile_to_be_updated.xml"
+        ).decode("ascii")
+        _assert_same_xml(data, "xmldescriptionfile_expected_1.xml")
 
         ds = ogr.Open("/vsimem/ogr_wfs_xmldescriptionfile_to_be_updated.xml")
         lyr = ds.GetLayer(0)
         assert lyr.GetLayerDefn().GetFieldCount() == 8
         ds = None
 
-        f = gdal.VSIFOpenL("/vsimem/ogr_wfs_xmldescriptionfile_to_be_updated.xml", "rb")
-        data = gdal.VSIFReadL(1, 100000, f).decode("ascii")
-        gdal.VSIFCloseL(f)
-        assert (
-            data
-            == """<OGRWFSDataSource>
-  <URL>/vsimem/wfs_endpoint</URL>
-  <WFS_Capabilities version="1.1.0">
-    <FeatureTypeList>
-      <FeatureType />
-      <FeatureType>
-        <Name>my_layer</Name>
-      </FeatureType>
-    </FeatureTypeList>
-  </WFS_Capabilities>
-  <OGRWFSLayer name="my_layer">
-    <xsd:schema xmlns:foo="http://foo" xmlns:gml="http://www.opengis.net/gml" xmlns:xsd="http://www.w3.org/2001/XMLSchema" elementFormDefault="qualified" targetNamespace="http://foo">
-      <xsd:import namespace="http://www.opengis.net/gml" schemaLocation="http://foo/schemas/gml/3.1.1/base/gml.xsd" />
-      <xsd:complexType name="my_layerType">
-        <xsd:complexContent>
-          <xsd:extension base="gml:AbstractFeatureType">
-            <xsd:sequence>
-              <xsd:element maxOccurs="1" minOccurs="0" name="str" nillable="true" type="xsd:string" />
-              <xsd:element maxOccurs="1" minOccurs="0" name="boolean" nillable="true" type="xsd:boolean" />
-              <xsd:element maxOccurs="1" minOccurs="0" name="short" nillable="true" type="xsd:short" />
-              <xsd:element maxOccurs="1" minOccurs="0" name="int" nillable="true" type="xsd:int" />
-              <xsd:element maxOccurs="1" minOccurs="0" name="float" nillable="true" type="xsd:float" />
-              <xsd:element maxOccurs="1" minOccurs="0" name="double" nillable="true" type="xsd:double" />
-              <xsd:element maxOccurs="1" minOccurs="0" name="dt" nillable="true" type="xsd:dateTime" />
-              <xsd:element maxOccurs="1" minOccurs="0" name="shape" nillable="true" type="gml:PointPropertyType" />
-            </xsd:sequence>
-          </xsd:extension>
-        </xsd:complexContent>
-      </xsd:complexType>
-      <xsd:element name="my_layer" substitutionGroup="gml:_Feature" type="foo:my_layerType" />
-    </xsd:schema>
-  </OGRWFSLayer>
-</OGRWFSDataSource>
-"""
-        )
+        data = _vsi_read_all(
+            "/vsimem/ogr_wfs_xmldescriptionfile_to_be_updated.xml"
+        ).decode("ascii")
+        _assert_same_xml(data, "xmldescriptionfile_expected_2.xml")
 
         ds = ogr.Open("/vsimem/ogr_wfs_xmldescriptionfile_to_be_updated.xml")
         lyr = ds.GetLayer(0)
@@ -1508,11 +1536,7 @@ def test_ogr_wfs_vsimem_wfs110_one_layer_missing_getfeaturecount_no_hits(
 ###############################################################################
 
 
-@pytest.fixture()
-def wfs110_onelayer_get_caps_with_bbox():
-    with gdaltest.tempfile(
-        "/vsimem/wfs_endpoint?SERVICE=WFS&REQUEST=GetCapabilities",
-        """<WFS_Capabilities version="1.1.0">
+_CAPS_WITH_BBOX_XML = """<WFS_Capabilities version="1.1.0">
     <OperationsMetadata>
         <ows:Operation name="GetFeature">
             <ows:Parameter name="resultType">
@@ -1532,129 +1556,69 @@ def wfs110_onelayer_get_caps_with_bbox():
         </FeatureType>
     </FeatureTypeList>
 </WFS_Capabilities>
-""",
-    ):
-        yield
+"""
 
 
-###############################################################################
+@pytest.fixture(scope="module")
+def wfs110_onelayer_get_caps_with_bbox():
+    with gdaltest.tempfile(
+        "/vsimem/wfs_endpoint?SERVICE=WFS&REQUEST=GetCapabilities",
+        _CAPS_WITH_BBOX_XML,
+    ):
+        yield
 
 
-def test_ogr_wfs_vsimem_wfs110_one_layer_missing_getfeaturecount_with_hits(
+# Function-scoped on purpose: OGRWFSLayer caches the feature count and the
+# fetch-failure state, so sharing one datasource across the failure-path
+# tests below would have them assert on cached results instead of issuing
+# (and failing) their own requests.
+@pytest.fixture()
+def wfs110_onelayer_ds(
     wfs110_onelayer_get_caps_with_bbox, wfs110_onelayer_describefeaturetype
 ):
-
-    ds = ogr.Open("WFS:/vsimem/wfs_endpoint")
-    lyr = ds.GetLayer(0)
-
-    gdal.ErrorReset()
-    with gdal.quiet_errors():
-        count = lyr.GetFeatureCount()
-    assert gdal.GetLastErrorMsg() != ""
-    assert count == 0
-
-
-###############################################################################
-
-
-def test_ogr_wfs_vsimem_wfs110_one_layer_invalid_getfeaturecount_with_hits(
-    wfs110_onelayer_get_caps_with_bbox, wfs110_onelayer_describefeaturetype
-):
-
     ds = ogr.Open("WFS:/vsimem/wfs_endpoint")
-    lyr = ds.GetLayer(0)
-
-    with gdaltest.tempfile(
-        "/vsimem/wfs_endpoint?SERVICE=WFS&VERSION=1.1.0&REQUEST=GetFeature&TYPENAME=my_layer&RESULTTYPE=hits",
-        """<invalid_xml""",
-    ):
-        gdal.ErrorReset()
-        with gdal.quiet_errors():
-            count = lyr.GetFeatureCount()
-        assert gdal.GetLastErrorMsg() != ""
-        assert count == 0
+    assert ds is not None
+    yield ds
 
 
 ###############################################################################
 
 
-def test_ogr_wfs_vsimem_wfs110_one_layer_getfeaturecount_with_hits_missing_FeatureCollection(
-    wfs110_onelayer_get_caps_with_bbox, wfs110_onelayer_describefeaturetype
+def test_ogr_wfs_vsimem_wfs110_one_layer_missing_getfeaturecount_with_hits(
+    wfs110_onelayer_ds,
 ):
 
-    ds = ogr.Open("WFS:/vsimem/wfs_endpoint")
-    lyr = ds.GetLayer(0)
+    lyr = wfs110_onelayer_ds.GetLayer(0)
 
-    with gdaltest.tempfile(
-        "/vsimem/wfs_endpoint?SERVICE=WFS&VERSION=1.1.0&REQUEST=GetFeature&TYPENAME=my_layer&RESULTTYPE=hits",
-        """<dummy_xml/>""",
-    ):
-        gdal.ErrorReset()
-        with gdal.quiet_errors():
-            count = lyr.GetFeatureCount()
-        assert gdal.GetLastErrorMsg() != ""
-        assert count == 0
-
-
-###############################################################################
-
-
-def test_ogr_wfs_vsimem_wfs110_one_layer_getfeaturecount_with_hits_invalid_xml(
-    wfs110_onelayer_get_caps_with_bbox, wfs110_onelayer_describefeaturetype
-):
-
-    ds = ogr.Open("WFS:/vsimem/wfs_endpoint")
-    lyr = ds.GetLayer(0)
-
-    with gdaltest.tempfile(
-        "/vsimem/wfs_endpoint?SERVICE=WFS&VERSION=1.1.0&REQUEST=GetFeature&TYPENAME=my_layer&RESULTTYPE=hits",
-        """<invalid_xml""",
-    ):
-        gdal.ErrorReset()
-        with gdal.quiet_errors():
-            count = lyr.GetFeatureCount()
-        assert gdal.GetLastErrorMsg() != ""
-        assert count == 0
+    with gdaltest.error_raised(gdal.CE_Failure):
+        count = lyr.GetFeatureCount()
+    assert count == 0
 
 
 ###############################################################################
 
 
-def test_ogr_wfs_vsimem_wfs110_one_layer_getfeaturecount_with_hits_ServiceExceptionReport(
-    wfs110_onelayer_get_caps_with_bbox, wfs110_onelayer_describefeaturetype
-):
-
-    ds = ogr.Open("WFS:/vsimem/wfs_endpoint")
-    lyr = ds.GetLayer(0)
-
-    with gdaltest.tempfile(
-        "/vsimem/wfs_endpoint?SERVICE=WFS&VERSION=1.1.0&REQUEST=GetFeature&TYPENAME=my_layer&RESULTTYPE=hits",
-        """<ServiceExceptionReport/>""",
-    ):
-        gdal.ErrorReset()
-        with gdal.quiet_errors():
-            count = lyr.GetFeatureCount()
-        assert gdal.GetLastErrorMsg() != ""
-        assert count == 0
-
-
-###############################################################################
-def test_ogr_wfs_vsimem_wfs110_one_layer_getfeaturecount_with_hits_missing_numberOfFeatures(
-    wfs110_onelayer_get_caps_with_bbox, wfs110_onelayer_describefeaturetype
+@pytest.mark.parametrize(
+    "content",
+    [
+        pytest.param("<invalid_xml", id="invalid_xml"),
+        pytest.param("<dummy_xml/>", id="missing_FeatureCollection"),
+        pytest.param("<ServiceExceptionReport/>", id="ServiceExceptionReport"),
+        pytest.param("<FeatureCollection/>", id="missing_numberOfFeatures"),
+    ],
+)
+def test_ogr_wfs_vsimem_wfs110_one_layer_invalid_getfeaturecount_with_hits(
+    wfs110_onelayer_ds, content
 ):
 
-    ds = ogr.Open("WFS:/vsimem/wfs_endpoint")
-    lyr = ds.GetLayer(0)
+    lyr = wfs110_onelayer_ds.GetLayer(0)
 
     with gdaltest.tempfile(
         "/vsimem/wfs_endpoint?SERVICE=WFS&VERSION=1.1.0&REQUEST=GetFeature&TYPENAME=my_layer&RESULTTYPE=hits",
-        """<FeatureCollection/>""",
-    ):
-        gdal.ErrorReset()
-        with gdal.quiet_errors():
-            count = lyr.GetFeatureCount()
-        assert gdal.GetLastErrorMsg() != ""
-        assert count == 0
+        content,
+    ), gdaltest.error_raised(gdal.CE_Failure):
+        count = lyr.GetFeatureCount()
+    assert count == 0
 
 
 ###############################################################################
@@ -1669,19 +1633,7 @@ def test_ogr_wfs_vsimem_wfs110_one_layer_getfeaturecount_with_hits(
 
     with gdaltest.tempfile(
         "/vsimem/wfs_endpoint?SERVICE=WFS&VERSION=1.1.0&REQUEST=GetFeature&TYPENAME=my_layer&RESULTTYPE=hits",
-        """<wfs:FeatureCollection xmlns:xs="http://www.w3.org/2001/XMLSchema"
-xmlns:ogc="http://www.opengis.net/ogc"
-xmlns:foo="http://foo"
-xmlns:wfs="http://www.opengis.net/wfs"
-xmlns:ows="http://www.opengis.net/ows"
-xmlns:xlink="http://www.w3.org/1999/xlink"
-xmlns:gml="http://www.opengis.net/gml"
-xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
-numberOfFeatures="1"
-timeStamp="2015-04-17T14:14:24.859Z"
-xsi:schemaLocation="http://foo /vsimem/wfs_endpoint?SERVICE=WFS&amp;VERSION=1.1.0&amp;REQUEST=DescribeFeatureType&amp;TYPENAME=my_layer
-                    http://www.opengis.net/wfs http://schemas.opengis.net/wfs/1.1.0/wfs.xsd">
-</wfs:FeatureCollection>""",
+        make_feature_xml(),
     ):
         count = lyr.GetFeatureCount()
         assert count == 1
@@ -1691,16 +1643,14 @@ xsi:schemaLocation="http://foo /vsimem/wfs_endpoint?SERVICE=WFS&amp;VERSION=1.1.
 
 
 def test_ogr_wfs_vsimem_wfs110_one_layer_missing_getfeature(
-    wfs110_onelayer_get_caps_with_bbox, wfs110_onelayer_describefeaturetype
+    wfs110_onelayer_ds,
 ):
 
-    ds = ogr.Open("WFS:/vsimem/wfs_endpoint")
-    lyr = ds.GetLayer(0)
+    lyr = wfs110_onelayer_ds.GetLayer(0)
+    lyr.ResetReading()
 
-    gdal.ErrorReset()
-    with gdal.quiet_errors():
+    with gdaltest.error_raised(gdal.CE_Failure):
         f = lyr.GetNextFeature()
-    assert gdal.GetLastErrorMsg() != ""
     assert f is None
 
 
@@ -1708,58 +1658,46 @@ def test_ogr_wfs_vsimem_wfs110_one_layer_missing_getfeature(
 
 
 def test_ogr_wfs_vsimem_wfs110_one_layer_invalid_getfeature(
-    wfs110_onelayer_get_caps_with_bbox,
-    wfs110_onelayer_describefeaturetype,
+    wfs110_onelayer_ds,
     with_and_without_streaming,
 ):
 
-    ds = ogr.Open("WFS:/vsimem/wfs_endpoint")
-    lyr = ds.GetLayer(0)
+    lyr = wfs110_onelayer_ds.GetLayer(0)
+    lyr.ResetReading()
 
     with gdaltest.tempfile(
         "/vsimem/wfs_endpoint?SERVICE=WFS&VERSION=1.1.0&REQUEST=GetFeature&TYPENAME=my_layer",
         """<invalid_xml
 """,
-    ):
-        gdal.ErrorReset()
-        with gdal.quiet_errors():
-            f = lyr.GetNextFeature()
-        assert gdal.GetLastErrorMsg() != ""
-        assert f is None
+    ), gdaltest.error_raised(gdal.CE_Failure):
+        f = lyr.GetNextFeature()
+    assert f is None
 
 
 ###############################################################################
 
 
 def test_ogr_wfs_vsimem_wfs110_one_layer_exception_getfeature(
-    wfs110_onelayer_get_caps_with_bbox,
-    wfs110_onelayer_describefeaturetype,
+    wfs110_onelayer_ds,
     with_and_without_streaming,
 ):
 
-    ds = ogr.Open("WFS:/vsimem/wfs_endpoint")
-    lyr = ds.GetLayer(0)
+    lyr = wfs110_onelayer_ds.GetLayer(0)
+    lyr.ResetReading()
 
     with gdaltest.tempfile(
         "/vsimem/wfs_endpoint?SERVICE=WFS&VERSION=1.1.0&REQUEST=GetFeature&TYPENAME=my_layer",
         """<ServiceExceptionReport/>
 """,
-    ):
-        gdal.ErrorReset()
-        with gdal.quiet_errors():
-            f = lyr.GetNextFeature()
-        assert gdal.GetLastErrorMsg().find("Error returned by server") >= 0
-        assert f is None
+    ), gdaltest.error_raised(gdal.CE_Failure, "Error returned by server"):
+        f = lyr.GetNextFeature()
+    assert f is None
 
 
 ###############################################################################
 
 
-@pytest.fixture
-def wfs110_onelayer_get_caps_with_bbox_no_hits():
-    with gdaltest.tempfile(
-        "/vsimem/wfs_endpoint?SERVICE=WFS&REQUEST=GetCapabilities",
-        """<WFS_Capabilities version="1.1.0">
+_CAPS_WITH_BBOX_NO_HITS_XML = """<WFS_Capabilities version="1.1.0">
     <FeatureTypeList>
         <FeatureType>
             <Name>my_layer</Name>
@@ -1771,7 +1709,14 @@ def wfs110_onelayer_get_caps_with_bbox_no_hits():
         </FeatureType>
     </FeatureTypeList>
 </WFS_Capabilities>
-""",
+"""
+
+
+@pytest.fixture(scope="module")
+def wfs110_onelayer_get_caps_with_bbox_no_hits():
+    with gdaltest.tempfile(
+        "/vsimem/wfs_endpoint?SERVICE=WFS&REQUEST=GetCapabilities",
+        _CAPS_WITH_BBOX_NO_HITS_XML,
     ):
         yield
 
@@ -1790,36 +1735,7 @@ def test_ogr_wfs_vsimem_wfs110_one_layer_getfeature(
 
     with gdaltest.tempfile(
         "/vsimem/wfs_endpoint?SERVICE=WFS&VERSION=1.1.0&REQUEST=GetFeature&TYPENAME=my_layer",
-        """<wfs:FeatureCollection xmlns:xs="http://www.w3.org/2001/XMLSchema"
-xmlns:ogc="http://www.opengis.net/ogc"
-xmlns:foo="http://foo"
-xmlns:wfs="http://www.opengis.net/wfs"
-xmlns:ows="http://www.opengis.net/ows"
-xmlns:xlink="http://www.w3.org/1999/xlink"
-xmlns:gml="http://www.opengis.net/gml"
-xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
-numberOfFeatures="1"
-timeStamp="2015-04-17T14:14:24.859Z"
-xsi:schemaLocation="http://foo /vsimem/wfs_endpoint?SERVICE=WFS&amp;VERSION=1.1.0&amp;REQUEST=DescribeFeatureType&amp;TYPENAME=my_layer
-                    http://www.opengis.net/wfs http://schemas.opengis.net/wfs/1.1.0/wfs.xsd">
-    <gml:featureMembers>
-        <foo:my_layer gml:id="my_layer.1">
-            <foo:str>str</foo:str>
-            <foo:boolean>true</foo:boolean>
-            <foo:short>1</foo:short>
-            <foo:int>123456789</foo:int>
-            <foo:float>1.2</foo:float>
-            <foo:double>1.23</foo:double>
-            <foo:dt>2015-04-17T12:34:56Z</foo:dt>
-            <foo:shape>
-                <gml:Point srsDimension="2" srsName="urn:ogc:def:crs:EPSG::4326">
-                    <gml:pos>49 2</gml:pos>
-                </gml:Point>
-            </foo:shape>
-        </foo:my_layer>
-    </gml:featureMembers>
-</wfs:FeatureCollection>
-""",
+        _xml("get_feature_my_layer.xml"),
     ):
         f = lyr.GetNextFeature()
         if (
@@ -1845,25 +1761,14 @@ xsi:schemaLocation="http://foo /vsimem/wfs_endpoint?SERVICE=WFS&amp;VERSION=1.1.
 
         with gdaltest.tempfile(
             "/vsimem/wfs_endpoint?SERVICE=WFS&VERSION=1.1.0&REQUEST=GetFeature&TYPENAME=my_layer&PROPERTYNAME=str,boolean,shape",
-            """<wfs:FeatureCollection xmlns:xs="http://www.w3.org/2001/XMLSchema"
-    xmlns:ogc="http://www.opengis.net/ogc"
-    xmlns:foo="http://foo"
-    xmlns:wfs="http://www.opengis.net/wfs"
-    xmlns:ows="http://www.opengis.net/ows"
-    xmlns:xlink="http://www.w3.org/1999/xlink"
-    xmlns:gml="http://www.opengis.net/gml"
-    xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
-    numberOfFeatures="1"
-    timeStamp="2015-04-17T14:14:24.859Z"
-    xsi:schemaLocation="http://foo /vsimem/wfs_endpoint?SERVICE=WFS&amp;VERSION=1.1.0&amp;REQUEST=DescribeFeatureType&amp;TYPENAME=my_layer
-                        http://www.opengis.net/wfs http://schemas.opengis.net/wfs/1.1.0/wfs.xsd">
-        <gml:featureMembers>
-            <foo:my_layer gml:id="my_layer.100">
-                <foo:str>bar</foo:str>
-            </foo:my_layer>
-        </gml:featureMembers>
-    </wfs:FeatureCollection>
-    """,
+            make_feature_xml(
+                """    <gml:featureMembers>
+        <foo:my_layer gml:id="my_layer.100">
+            <foo:str>bar</foo:str>
+        </foo:my_layer>
+    </gml:featureMembers>
+"""
+            ),
         ), ds.ExecuteSQL("SELECT boolean, str FROM my_layer") as sql_lyr:
             f = sql_lyr.GetNextFeature()
             assert f["str"] == "bar"
@@ -1882,36 +1787,7 @@ def test_ogr_wfs_vsimem_wfs110_one_layer_getextent(
 
     with gdaltest.tempfile(
         "/vsimem/wfs_endpoint?SERVICE=WFS&VERSION=1.1.0&REQUEST=GetFeature&TYPENAME=my_layer",
-        """<wfs:FeatureCollection xmlns:xs="http://www.w3.org/2001/XMLSchema"
-xmlns:ogc="http://www.opengis.net/ogc"
-xmlns:foo="http://foo"
-xmlns:wfs="http://www.opengis.net/wfs"
-xmlns:ows="http://www.opengis.net/ows"
-xmlns:xlink="http://www.w3.org/1999/xlink"
-xmlns:gml="http://www.opengis.net/gml"
-xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
-numberOfFeatures="1"
-timeStamp="2015-04-17T14:14:24.859Z"
-xsi:schemaLocation="http://foo /vsimem/wfs_endpoint?SERVICE=WFS&amp;VERSION=1.1.0&amp;REQUEST=DescribeFeatureType&amp;TYPENAME=my_layer
-                    http://www.opengis.net/wfs http://schemas.opengis.net/wfs/1.1.0/wfs.xsd">
-    <gml:featureMembers>
-        <foo:my_layer gml:id="my_layer.1">
-            <foo:str>str</foo:str>
-            <foo:boolean>true</foo:boolean>
-            <foo:short>1</foo:short>
-            <foo:int>123456789</foo:int>
-            <foo:float>1.2</foo:float>
-            <foo:double>1.23</foo:double>
-            <foo:dt>2015-04-17T12:34:56Z</foo:dt>
-            <foo:shape>
-                <gml:Point srsDimension="2" srsName="urn:ogc:def:crs:EPSG::4326">
-                    <gml:pos>49 2</gml:pos>
-                </gml:Point>
-            </foo:shape>
-        </foo:my_layer>
-    </gml:featureMembers>
-</wfs:FeatureCollection>
-""",
+        _xml("get_feature_my_layer.xml"),
     ):
         lyr = ds.GetLayer(0)
         assert lyr.GetExtent() == (2, 2, 49, 49)
@@ -2027,23 +1903,8 @@ def test_ogr_wfs_vsimem_wfs110_one_layer_getextent_optimized(
 ###############################################################################
 
 
-@pytest.fixture()
-def wfs110_onelayer_get_caps_detailed():
-
-    with gdaltest.tempfile(
-        "/vsimem/wfs_endpoint?SERVICE=WFS&REQUEST=GetCapabilities",
-        """<WFS_Capabilities version="1.1.0">
-    <FeatureTypeList>
-        <FeatureType>
-            <Name>my_layer</Name>
-            <DefaultSRS>urn:ogc:def:crs:EPSG::4326</DefaultSRS>
-            <ows:WGS84BoundingBox>
-                <ows:LowerCorner>-180.0 -90.0</ows:LowerCorner>
-                <ows:UpperCorner>180.0 90.0</ows:UpperCorner>
-            </ows:WGS84BoundingBox>
-        </FeatureType>
-    </FeatureTypeList>
-  <ogc:Filter_Capabilities>
+# Filter capabilities block shared by several GetCapabilities documents below.
+_OGC_FILTER_CAPABILITIES_XML = """  <ogc:Filter_Capabilities>
     <ogc:Spatial_Capabilities>
       <ogc:GeometryOperands>
         <ogc:GeometryOperand>gml:Envelope</ogc:GeometryOperand>
@@ -2088,8 +1949,31 @@ def wfs110_onelayer_get_caps_detailed():
       <ogc:EID/>
     </ogc:Id_Capabilities>
   </ogc:Filter_Capabilities>
-</WFS_Capabilities>
-""",
+"""
+
+_CAPS_DETAILED_XML = (
+    """<WFS_Capabilities version="1.1.0">
+    <FeatureTypeList>
+        <FeatureType>
+            <Name>my_layer</Name>
+            <DefaultSRS>urn:ogc:def:crs:EPSG::4326</DefaultSRS>
+            <ows:WGS84BoundingBox>
+                <ows:LowerCorner>-180.0 -90.0</ows:LowerCorner>
+                <ows:UpperCorner>180.0 90.0</ows:UpperCorner>
+            </ows:WGS84BoundingBox>
+        </FeatureType>
+    </FeatureTypeList>
+"""
+    + _OGC_FILTER_CAPABILITIES_XML
+    + "</WFS_Capabilities>\n"
+)
+
+
+@pytest.fixture(scope="module")
+def wfs110_onelayer_get_caps_detailed():
+    with gdaltest.tempfile(
+        "/vsimem/wfs_endpoint?SERVICE=WFS&REQUEST=GetCapabilities",
+        _CAPS_DETAILED_XML,
     ):
         yield
 
@@ -2107,7 +1991,10 @@ def test_ogr_wfs_vsimem_wfs110_one_layer_getfeature_ogr_getfeature(
     lyr = ds.GetLayer(0)
 
     with gdaltest.tempfile(
-        "/vsimem/wfs_endpoint?SERVICE=WFS&VERSION=1.1.0&REQUEST=GetFeature&TYPENAME=my_layer&FILTER=%3CFilter%20xmlns%3D%22http:%2F%2Fwww.opengis.net%2Fogc%22%20xmlns:gml%3D%22http:%2F%2Fwww.opengis.net%2Fgml%22%3E%3CGmlObjectId%20id%3D%22my_layer.100%22%2F%3E%3C%2FFilter%3E",
+        "/vsimem/wfs_endpoint?SERVICE=WFS&VERSION=1.1.0&REQUEST=GetFeature&TYPENAME=my_layer&FILTER="
+        + _urlescape(
+            '<Filter xmlns="http://www.opengis.net/ogc" xmlns:gml="http://www.opengis.net/gml"><GmlObjectId id="my_layer.100"/></Filter>'
+        ),
         """<wfs:FeatureCollection xmlns:xs="http://www.w3.org/2001/XMLSchema"
 xmlns:ogc="http://www.opengis.net/ogc"
 xmlns:foo="http://foo"
@@ -2182,37 +2069,11 @@ def test_ogr_wfs_vsimem_wfs110_one_layer_filter_gml_id_success(
     lyr = ds.GetLayer(0)
 
     with gdaltest.tempfile(
-        "/vsimem/wfs_endpoint?SERVICE=WFS&VERSION=1.1.0&REQUEST=GetFeature&TYPENAME=my_layer&FILTER=%3CFilter%20xmlns%3D%22http:%2F%2Fwww.opengis.net%2Fogc%22%20xmlns:gml%3D%22http:%2F%2Fwww.opengis.net%2Fgml%22%3E%3CGmlObjectId%20id%3D%22my_layer.1%22%2F%3E%3CGmlObjectId%20id%3D%22my_layer.1%22%2F%3E%3C%2FFilter%3E",
-        """<wfs:FeatureCollection xmlns:xs="http://www.w3.org/2001/XMLSchema"
-xmlns:ogc="http://www.opengis.net/ogc"
-xmlns:foo="http://foo"
-xmlns:wfs="http://www.opengis.net/wfs"
-xmlns:ows="http://www.opengis.net/ows"
-xmlns:xlink="http://www.w3.org/1999/xlink"
-xmlns:gml="http://www.opengis.net/gml"
-xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
-numberOfFeatures="1"
-timeStamp="2015-04-17T14:14:24.859Z"
-xsi:schemaLocation="http://foo /vsimem/wfs_endpoint?SERVICE=WFS&amp;VERSION=1.1.0&amp;REQUEST=DescribeFeatureType&amp;TYPENAME=my_layer
-                    http://www.opengis.net/wfs http://schemas.opengis.net/wfs/1.1.0/wfs.xsd">
-    <gml:featureMembers>
-        <foo:my_layer gml:id="my_layer.1">
-            <foo:str>str</foo:str>
-            <foo:boolean>true</foo:boolean>
-            <foo:short>1</foo:short>
-            <foo:int>123456789</foo:int>
-            <foo:float>1.2</foo:float>
-            <foo:double>1.23</foo:double>
-            <foo:dt>2015-04-17T12:34:56Z</foo:dt>
-            <foo:shape>
-                <gml:Point srsDimension="2" srsName="urn:ogc:def:crs:EPSG::4326">
-                    <gml:pos>49 2</gml:pos>
-                </gml:Point>
-            </foo:shape>
-        </foo:my_layer>
-    </gml:featureMembers>
-</wfs:FeatureCollection>
-""",
+        "/vsimem/wfs_endpoint?SERVICE=WFS&VERSION=1.1.0&REQUEST=GetFeature&TYPENAME=my_layer&FILTER="
+        + _urlescape(
+            '<Filter xmlns="http://www.opengis.net/ogc" xmlns:gml="http://www.opengis.net/gml"><GmlObjectId id="my_layer.1"/><GmlObjectId id="my_layer.1"/></Filter>'
+        ),
+        _xml("get_feature_my_layer.xml"),
     ):
         lyr.SetAttributeFilter("gml_id = 'my_layer.1' OR gml_id = 'my_layer.1'")
 
@@ -2229,93 +2090,38 @@ def test_ogr_wfs_vsimem_wfs110_one_layer_filter(
     with_and_without_streaming,
 ):
 
-    ds = ogr.Open("WFS:/vsimem/wfs_endpoint")
-    lyr = ds.GetLayer(0)
-
-    with gdaltest.tempfile(
-        "/vsimem/wfs_endpoint?SERVICE=WFS&VERSION=1.1.0&REQUEST=GetFeature&TYPENAME=my_layer&FILTER=%3CFilter%20xmlns%3D%22http:%2F%2Fwww.opengis.net%2Fogc%22%20xmlns:gml%3D%22http:%2F%2Fwww.opengis.net%2Fgml%22%3E%3COr%3E%3COr%3E%3COr%3E%3COr%3E%3CAnd%3E%3CAnd%3E%3CPropertyIsEqualTo%3E%3CPropertyName%3Estr%3C%2FPropertyName%3E%3CLiteral%3Estr%3C%2FLiteral%3E%3C%2FPropertyIsEqualTo%3E%3CPropertyIsEqualTo%3E%3CPropertyName%3Eshort%3C%2FPropertyName%3E%3CLiteral%3E1%3C%2FLiteral%3E%3C%2FPropertyIsEqualTo%3E%3C%2FAnd%3E%3CPropertyIsEqualTo%3E%3CPropertyName%3Efloat%3C%2FPropertyName%3E%3CLiteral%3E1.2%3C%2FLiteral%3E%3C%2FPropertyIsEqualTo%3E%3C%2FAnd%3E%3CPropertyIsLike%20wildCard%3D%22%2A%22%20singleChar%3D%22_%22%20escapeChar%3D%22%21%22%20matchCase%3D%22true%22%3E%3CPropertyName%3Estr%3C%2FPropertyName%3E%3CLiteral%3Est%2A%3C%2FLiteral%3E%3C%2FPropertyIsLike%3E%3C%2FOr%3E%3COr%3E%3CNot%3E%3CPropertyIsNull%3E%3CPropertyName%3Eboolean%3C%2FPropertyName%3E%3C%2FPropertyIsNull%3E%3C%2FNot%3E%3CPropertyIsGreaterThan%3E%3CPropertyName%3Eint%3C%2FPropertyName%3E%3CLiteral%3E1%3C%2FLiteral%3E%3C%2FPropertyIsGreaterThan%3E%3C%2FOr%3E%3C%2FOr%3E%3COr%3E%3COr%3E%3CPropertyIsGreaterThanOrEqualTo%3E%3CPropertyName%3Eint%3C%2FPropertyName%3E%3CLiteral%3E1%3C%2FLiteral%3E%3C%2FPropertyIsGreaterThanOrEqualTo%3E%3CPropertyIsNotEqualTo%3E%3CPropertyName%3Eint%3C%2FPropertyName%3E%3CLiteral%3E2%3C%2FLiteral%3E%3C%2FPropertyIsNotEqualTo%3E%3C%2FOr%3E%3COr%3E%3CPropertyIsLessThan%3E%3CPropertyName%3Eint%3C%2FPropertyName%3E%3CLiteral%3E2000000000%3C%2FLiteral%3E%3C%2FPropertyIsLessThan%3E%3CPropertyIsLessThanOrEqualTo%3E%3CPropertyName%3Eint%3C%2FPropertyName%3E%3CLiteral%3E2000000000%3C%2FLiteral%3E%3C%2FPropertyIsLessThanOrEqualTo%3E%3C%2FOr%3E%3C%2FOr%3E%3C%2FOr%3E%3COr%3E%3CPropertyIsEqualTo%3E%3CPropertyName%3Estr%3C%2FPropertyName%3E%3CLiteral%3Efoo%3C%2FLiteral%3E%3C%2FPropertyIsEqualTo%3E%3CPropertyIsEqualTo%3E%3CPropertyName%3Estr%3C%2FPropertyName%3E%3CLiteral%3Ebar%3C%2FLiteral%3E%3C%2FPropertyIsEqualTo%3E%3C%2FOr%3E%3C%2FOr%3E%3C%2FFilter%3E",
-        """<wfs:FeatureCollection xmlns:xs="http://www.w3.org/2001/XMLSchema"
-xmlns:ogc="http://www.opengis.net/ogc"
-xmlns:foo="http://foo"
-xmlns:wfs="http://www.opengis.net/wfs"
-xmlns:ows="http://www.opengis.net/ows"
-xmlns:xlink="http://www.w3.org/1999/xlink"
-xmlns:gml="http://www.opengis.net/gml"
-xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
-numberOfFeatures="1"
-timeStamp="2015-04-17T14:14:24.859Z"
-xsi:schemaLocation="http://foo /vsimem/wfs_endpoint?SERVICE=WFS&amp;VERSION=1.1.0&amp;REQUEST=DescribeFeatureType&amp;TYPENAME=my_layer
-                    http://www.opengis.net/wfs http://schemas.opengis.net/wfs/1.1.0/wfs.xsd">
-    <gml:featureMembers>
-        <foo:my_layer gml:id="my_layer.1">
-            <foo:str>str</foo:str>
-            <foo:boolean>true</foo:boolean>
-            <foo:short>1</foo:short>
-            <foo:int>123456789</foo:int>
-            <foo:float>1.2</foo:float>
-            <foo:double>1.23</foo:double>
-            <foo:dt>2015-04-17T12:34:56Z</foo:dt>
-            <foo:shape>
-                <gml:Point srsDimension="2" srsName="urn:ogc:def:crs:EPSG::4326">
-                    <gml:pos>49 2</gml:pos>
-                </gml:Point>
-            </foo:shape>
-        </foo:my_layer>
-    </gml:featureMembers>
-</wfs:FeatureCollection>
-""",
-    ):
-        lyr.SetAttributeFilter(
-            "(str = 'str' AND short = 1 AND float = 1.2) OR str LIKE 'st%' OR boolean IS NOT NULL OR int > 1 OR int >= 1 or int != 2 or int < 2000000000 or int <= 2000000000 OR str IN ('foo', 'bar')"
-        )
-
-        f = lyr.GetNextFeature()
-        assert f is not None
-
-
-###############################################################################
-
-
-def test_ogr_wfs_vsimem_wfs110_one_layer_filter_spatial_ops(
-    wfs110_onelayer_get_caps_detailed,
-    wfs110_onelayer_describefeaturetype,
-    with_and_without_streaming,
-):
-
-    ds = ogr.Open("WFS:/vsimem/wfs_endpoint")
-    lyr = ds.GetLayer(0)
-
-    content = """<wfs:FeatureCollection xmlns:xs="http://www.w3.org/2001/XMLSchema"
-xmlns:ogc="http://www.opengis.net/ogc"
-xmlns:foo="http://foo"
-xmlns:wfs="http://www.opengis.net/wfs"
-xmlns:ows="http://www.opengis.net/ows"
-xmlns:xlink="http://www.w3.org/1999/xlink"
-xmlns:gml="http://www.opengis.net/gml"
-xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
-numberOfFeatures="1"
-timeStamp="2015-04-17T14:14:24.859Z"
-xsi:schemaLocation="http://foo /vsimem/wfs_endpoint?SERVICE=WFS&amp;VERSION=1.1.0&amp;REQUEST=DescribeFeatureType&amp;TYPENAME=my_layer
-                    http://www.opengis.net/wfs http://schemas.opengis.net/wfs/1.1.0/wfs.xsd">
-    <gml:featureMembers>
-        <foo:my_layer gml:id="my_layer.1">
-            <foo:str>str</foo:str>
-            <foo:boolean>true</foo:boolean>
-            <foo:short>1</foo:short>
-            <foo:int>123456789</foo:int>
-            <foo:float>1.2</foo:float>
-            <foo:double>1.23</foo:double>
-            <foo:dt>2015-04-17T12:34:56Z</foo:dt>
-            <foo:shape>
-                <gml:Point srsDimension="2" srsName="urn:ogc:def:crs:EPSG::4326">
-                    <gml:pos>49 2</gml:pos>
-                </gml:Point>
-            </foo:shape>
-        </foo:my_layer>
-    </gml:featureMembers>
-</wfs:FeatureCollection>
-"""
-
+    ds = ogr.Open("WFS:/vsimem/wfs_endpoint")
+    lyr = ds.GetLayer(0)
+
+    with gdaltest.tempfile(
+        "/vsimem/wfs_endpoint?SERVICE=WFS&VERSION=1.1.0&REQUEST=GetFeature&TYPENAME=my_layer&FILTER="
+        + _urlescape(
+            '<Filter xmlns="http://www.opengis.net/ogc" xmlns:gml="http://www.opengis.net/gml"><Or><Or><Or><Or><And><And><PropertyIsEqualTo><PropertyName>str</PropertyName><Literal>str</Literal></PropertyIsEqualTo><PropertyIsEqualTo><PropertyName>short</PropertyName><Literal>1</Literal></PropertyIsEqualTo></And><PropertyIsEqualTo><PropertyName>float</PropertyName><Literal>1.2</Literal></PropertyIsEqualTo></And><PropertyIsLike wildCard="*" singleChar="_" escapeChar="!" matchCase="true"><PropertyName>str</PropertyName><Literal>st*</Literal></PropertyIsLike></Or><Or><Not><PropertyIsNull><PropertyName>boolean</PropertyName></PropertyIsNull></Not><PropertyIsGreaterThan><PropertyName>int</PropertyName><Literal>1</Literal></PropertyIsGreaterThan></Or></Or><Or><Or><PropertyIsGreaterThanOrEqualTo><PropertyName>int</PropertyName><Literal>1</Literal></PropertyIsGreaterThanOrEqualTo><PropertyIsNotEqualTo><PropertyName>int</PropertyName><Literal>2</Literal></PropertyIsNotEqualTo></Or><Or><PropertyIsLessThan><PropertyName>int</PropertyName><Literal>2000000000</Literal></PropertyIsLessThan><PropertyIsLessThanOrEqualTo><PropertyName>int</PropertyName><Literal>2000000000</Literal></PropertyIsLessThanOrEqualTo></Or></Or></Or><Or><PropertyIsEqualTo><PropertyName>str</PropertyName><Literal>foo</Literal></PropertyIsEqualTo><PropertyIsEqualTo><PropertyName>str</PropertyName><Literal>bar</Literal></PropertyIsEqualTo></Or></Or></Filter>'
+        ),
+        _xml("get_feature_my_layer.xml"),
+    ):
+        lyr.SetAttributeFilter(
+            "(str = 'str' AND short = 1 AND float = 1.2) OR str LIKE 'st%' OR boolean IS NOT NULL OR int > 1 OR int >= 1 or int != 2 or int < 2000000000 or int <= 2000000000 OR str IN ('foo', 'bar')"
+        )
+
+        f = lyr.GetNextFeature()
+        assert f is not None
+
+
+###############################################################################
+
+
+def test_ogr_wfs_vsimem_wfs110_one_layer_filter_spatial_ops(
+    wfs110_onelayer_get_caps_detailed,
+    wfs110_onelayer_describefeaturetype,
+    with_and_without_streaming,
+):
+
+    ds = ogr.Open("WFS:/vsimem/wfs_endpoint")
+    lyr = ds.GetLayer(0)
+
+    content = _xml("get_feature_my_layer.xml")
+
     # Invalid syntax
     with gdal.quiet_errors():
         ret = lyr.SetAttributeFilter("ST_Intersects(shape)")
@@ -2448,7 +2254,10 @@ xsi:schemaLocation="http://foo /vsimem/wfs_endpoint?SERVICE=WFS&amp;VERSION=1.1.
 
     # Now valid requests
     with gdaltest.tempfile(
-        "/vsimem/wfs_endpoint?SERVICE=WFS&VERSION=1.1.0&REQUEST=GetFeature&TYPENAME=my_layer&FILTER=%3CFilter%20xmlns%3D%22http:%2F%2Fwww.opengis.net%2Fogc%22%20xmlns:gml%3D%22http:%2F%2Fwww.opengis.net%2Fgml%22%3E%3COr%3E%3COr%3E%3CIntersects%3E%3CPropertyName%3Eshape%3C%2FPropertyName%3E%3Cgml:Envelope%20srsName%3D%22urn:ogc:def:crs:EPSG::4326%22%3E%3Cgml:lowerCorner%3E48.5%201.5%3C%2Fgml:lowerCorner%3E%3Cgml:upperCorner%3E49.5%202.5%3C%2Fgml:upperCorner%3E%3C%2Fgml:Envelope%3E%3C%2FIntersects%3E%3CIntersects%3E%3CPropertyName%3Eshape%3C%2FPropertyName%3E%3Cgml:Envelope%20srsName%3D%22urn:ogc:def:crs:EPSG::4326%22%3E%3Cgml:lowerCorner%3E48.5%201.5%3C%2Fgml:lowerCorner%3E%3Cgml:upperCorner%3E49.5%202.5%3C%2Fgml:upperCorner%3E%3C%2Fgml:Envelope%3E%3C%2FIntersects%3E%3C%2FOr%3E%3COr%3E%3CIntersects%3E%3CPropertyName%3Eshape%3C%2FPropertyName%3E%3Cgml:Envelope%20srsName%3D%22EPSG:4326%22%3E%3Cgml:lowerCorner%3E1.5%2048.5%3C%2Fgml:lowerCorner%3E%3Cgml:upperCorner%3E2.5%2049.5%3C%2Fgml:upperCorner%3E%3C%2Fgml:Envelope%3E%3C%2FIntersects%3E%3CIntersects%3E%3CPropertyName%3Eshape%3C%2FPropertyName%3E%3Cgml:Envelope%20srsName%3D%22urn:ogc:def:crs:EPSG::32630%22%3E%3Cgml:lowerCorner%3E380000%205370000%3C%2Fgml:lowerCorner%3E%3Cgml:upperCorner%3E470000%205490000%3C%2Fgml:upperCorner%3E%3C%2Fgml:Envelope%3E%3C%2FIntersects%3E%3C%2FOr%3E%3C%2FOr%3E%3C%2FFilter%3E",
+        "/vsimem/wfs_endpoint?SERVICE=WFS&VERSION=1.1.0&REQUEST=GetFeature&TYPENAME=my_layer&FILTER="
+        + _urlescape(
+            '<Filter xmlns="http://www.opengis.net/ogc" xmlns:gml="http://www.opengis.net/gml"><Or><Or><Intersects><PropertyName>shape</PropertyName><gml:Envelope srsName="urn:ogc:def:crs:EPSG::4326"><gml:lowerCorner>48.5 1.5</gml:lowerCorner><gml:upperCorner>49.5 2.5</gml:upperCorner></gml:Envelope></Intersects><Intersects><PropertyName>shape</PropertyName><gml:Envelope srsName="urn:ogc:def:crs:EPSG::4326"><gml:lowerCorner>48.5 1.5</gml:lowerCorner><gml:upperCorner>49.5 2.5</gml:upperCorner></gml:Envelope></Intersects></Or><Or><Intersects><PropertyName>shape</PropertyName><gml:Envelope srsName="EPSG:4326"><gml:lowerCorner>1.5 48.5</gml:lowerCorner><gml:upperCorner>2.5 49.5</gml:upperCorner></gml:Envelope></Intersects><Intersects><PropertyName>shape</PropertyName><gml:Envelope srsName="urn:ogc:def:crs:EPSG::32630"><gml:lowerCorner>380000 5370000</gml:lowerCorner><gml:upperCorner>470000 5490000</gml:upperCorner></gml:Envelope></Intersects></Or></Or></Filter>'
+        ),
         content,
     ):
         lyr.SetAttributeFilter(
@@ -2461,7 +2270,12 @@ xsi:schemaLocation="http://foo /vsimem/wfs_endpoint?SERVICE=WFS&amp;VERSION=1.1.
         f = lyr.GetNextFeature()
         assert f is not None
 
-    three_intersects_request = "/vsimem/wfs_endpoint?SERVICE=WFS&VERSION=1.1.0&REQUEST=GetFeature&TYPENAME=my_layer&FILTER=%3CFilter%20xmlns%3D%22http:%2F%2Fwww.opengis.net%2Fogc%22%20xmlns:gml%3D%22http:%2F%2Fwww.opengis.net%2Fgml%22%3E%3COr%3E%3COr%3E%3CIntersects%3E%3CPropertyName%3Eshape%3C%2FPropertyName%3E%3Cgml:Polygon%20srsName%3D%22urn:ogc:def:crs:EPSG::4326%22%20gml:id%3D%22id1%22%3E%3Cgml:exterior%3E%3Cgml:LinearRing%3E%3Cgml:posList%3E48.5%201.5%2049.5%202.5%2049.5%202.5%2048.5%202.5%2048.5%201.5%3C%2Fgml:posList%3E%3C%2Fgml:LinearRing%3E%3C%2Fgml:exterior%3E%3C%2Fgml:Polygon%3E%3C%2FIntersects%3E%3CIntersects%3E%3CPropertyName%3Eshape%3C%2FPropertyName%3E%3Cgml:Polygon%20srsName%3D%22urn:ogc:def:crs:EPSG::4326%22%20gml:id%3D%22id2%22%3E%3Cgml:exterior%3E%3Cgml:LinearRing%3E%3Cgml:posList%3E48.5%201.5%2049.5%202.5%2049.5%202.5%2048.5%202.5%2048.5%201.5%3C%2Fgml:posList%3E%3C%2Fgml:LinearRing%3E%3C%2Fgml:exterior%3E%3C%2Fgml:Polygon%3E%3C%2FIntersects%3E%3C%2FOr%3E%3CIntersects%3E%3CPropertyName%3Eshape%3C%2FPropertyName%3E%3Cgml:Polygon%20srsName%3D%22EPSG:4326%22%20gml:id%3D%22id3%22%3E%3Cgml:exterior%3E%3Cgml:LinearRing%3E%3Cgml:posList%3E1.5%2048.5%202.5%2049.5%202.5%2049.5%202.5%2048.5%201.5%2048.5%3C%2Fgml:posList%3E%3C%2Fgml:LinearRing%3E%3C%2Fgml:exterior%3E%3C%2Fgml:Polygon%3E%3C%2FIntersects%3E%3C%2FOr%3E%3C%2FFilter%3E"
+    three_intersects_request = (
+        "/vsimem/wfs_endpoint?SERVICE=WFS&VERSION=1.1.0&REQUEST=GetFeature&TYPENAME=my_layer&FILTER="
+        + _urlescape(
+            '<Filter xmlns="http://www.opengis.net/ogc" xmlns:gml="http://www.opengis.net/gml"><Or><Or><Intersects><PropertyName>shape</PropertyName><gml:Polygon srsName="urn:ogc:def:crs:EPSG::4326" gml:id="id1"><gml:exterior><gml:LinearRing><gml:posList>48.5 1.5 49.5 2.5 49.5 2.5 48.5 2.5 48.5 1.5</gml:posList></gml:LinearRing></gml:exterior></gml:Polygon></Intersects><Intersects><PropertyName>shape</PropertyName><gml:Polygon srsName="urn:ogc:def:crs:EPSG::4326" gml:id="id2"><gml:exterior><gml:LinearRing><gml:posList>48.5 1.5 49.5 2.5 49.5 2.5 48.5 2.5 48.5 1.5</gml:posList></gml:LinearRing></gml:exterior></gml:Polygon></Intersects></Or><Intersects><PropertyName>shape</PropertyName><gml:Polygon srsName="EPSG:4326" gml:id="id3"><gml:exterior><gml:LinearRing><gml:posList>1.5 48.5 2.5 49.5 2.5 49.5 2.5 48.5 1.5 48.5</gml:posList></gml:LinearRing></gml:exterior></gml:Polygon></Intersects></Or></Filter>'
+        )
+    )
     with gdaltest.tempfile(
         three_intersects_request,
         content,
@@ -2476,7 +2290,10 @@ xsi:schemaLocation="http://foo /vsimem/wfs_endpoint?SERVICE=WFS&amp;VERSION=1.1.
         assert f is not None
 
     with gdaltest.tempfile(
-        "/vsimem/wfs_endpoint?SERVICE=WFS&VERSION=1.1.0&REQUEST=GetFeature&TYPENAME=my_layer&FILTER=%3CFilter%20xmlns%3D%22http:%2F%2Fwww.opengis.net%2Fogc%22%20xmlns:gml%3D%22http:%2F%2Fwww.opengis.net%2Fgml%22%3E%3CDWithin%3E%3CPropertyName%3Eshape%3C%2FPropertyName%3E%3Cgml:Envelope%20srsName%3D%22urn:ogc:def:crs:EPSG::4326%22%3E%3Cgml:lowerCorner%3E48.5%201.5%3C%2Fgml:lowerCorner%3E%3Cgml:upperCorner%3E49.5%202.5%3C%2Fgml:upperCorner%3E%3C%2Fgml:Envelope%3E%3CDistance%20unit%3D%22m%22%3E5%3C%2FDistance%3E%3C%2FDWithin%3E%3C%2FFilter%3E",
+        "/vsimem/wfs_endpoint?SERVICE=WFS&VERSION=1.1.0&REQUEST=GetFeature&TYPENAME=my_layer&FILTER="
+        + _urlescape(
+            '<Filter xmlns="http://www.opengis.net/ogc" xmlns:gml="http://www.opengis.net/gml"><DWithin><PropertyName>shape</PropertyName><gml:Envelope srsName="urn:ogc:def:crs:EPSG::4326"><gml:lowerCorner>48.5 1.5</gml:lowerCorner><gml:upperCorner>49.5 2.5</gml:upperCorner></gml:Envelope><Distance unit="m">5</Distance></DWithin></Filter>'
+        ),
         content,
     ):
         lyr.SetAttributeFilter("ST_DWithin(shape,ST_MakeEnvelope(1.5,48.5,2.5,49.5),5)")
@@ -2513,37 +2330,11 @@ def test_ogr_wfs_vsimem_wfs110_one_layer_spatial_filter(
     lyr = ds.GetLayer(0)
 
     with gdaltest.tempfile(
-        "/vsimem/wfs_endpoint?SERVICE=WFS&VERSION=1.1.0&REQUEST=GetFeature&TYPENAME=my_layer&FILTER=%3CFilter%20xmlns%3D%22http:%2F%2Fwww.opengis.net%2Fogc%22%20xmlns:gml%3D%22http:%2F%2Fwww.opengis.net%2Fgml%22%3E%3CBBOX%3E%3CPropertyName%3Eshape%3C%2FPropertyName%3E%3Cgml:Box%3E%3Cgml:coordinates%3E48.0000000000000000,1.0000000000000000%2050.0000000000000000,3.0000000000000000%3C%2Fgml:coordinates%3E%3C%2Fgml:Box%3E%3C%2FBBOX%3E%3C%2FFilter%3E",
-        """<wfs:FeatureCollection xmlns:xs="http://www.w3.org/2001/XMLSchema"
-xmlns:ogc="http://www.opengis.net/ogc"
-xmlns:foo="http://foo"
-xmlns:wfs="http://www.opengis.net/wfs"
-xmlns:ows="http://www.opengis.net/ows"
-xmlns:xlink="http://www.w3.org/1999/xlink"
-xmlns:gml="http://www.opengis.net/gml"
-xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
-numberOfFeatures="1"
-timeStamp="2015-04-17T14:14:24.859Z"
-xsi:schemaLocation="http://foo /vsimem/wfs_endpoint?SERVICE=WFS&amp;VERSION=1.1.0&amp;REQUEST=DescribeFeatureType&amp;TYPENAME=my_layer
-                    http://www.opengis.net/wfs http://schemas.opengis.net/wfs/1.1.0/wfs.xsd">
-    <gml:featureMembers>
-        <foo:my_layer gml:id="my_layer.1">
-            <foo:str>str</foo:str>
-            <foo:boolean>true</foo:boolean>
-            <foo:short>1</foo:short>
-            <foo:int>123456789</foo:int>
-            <foo:float>1.2</foo:float>
-            <foo:double>1.23</foo:double>
-            <foo:dt>2015-04-17T12:34:56Z</foo:dt>
-            <foo:shape>
-                <gml:Point srsDimension="2" srsName="urn:ogc:def:crs:EPSG::4326">
-                    <gml:pos>49 2</gml:pos>
-                </gml:Point>
-            </foo:shape>
-        </foo:my_layer>
-    </gml:featureMembers>
-</wfs:FeatureCollection>
-""",
+        "/vsimem/wfs_endpoint?SERVICE=WFS&VERSION=1.1.0&REQUEST=GetFeature&TYPENAME=my_layer&FILTER="
+        + _urlescape(
+            '<Filter xmlns="http://www.opengis.net/ogc" xmlns:gml="http://www.opengis.net/gml"><BBOX><PropertyName>shape</PropertyName><gml:Box><gml:coordinates>48.0000000000000000,1.0000000000000000 50.0000000000000000,3.0000000000000000</gml:coordinates></gml:Box></BBOX></Filter>'
+        ),
+        _xml("get_feature_my_layer.xml"),
     ):
         lyr.SetSpatialFilterRect(1, 48, 3, 50)
 
@@ -2577,37 +2368,11 @@ def test_ogr_wfs_vsimem_wfs110_one_layer_spatial_filter_and_attribute_filter(
     lyr = ds.GetLayer(0)
 
     with gdaltest.tempfile(
-        "/vsimem/wfs_endpoint?SERVICE=WFS&VERSION=1.1.0&REQUEST=GetFeature&TYPENAME=my_layer&FILTER=%3CFilter%20xmlns%3D%22http:%2F%2Fwww.opengis.net%2Fogc%22%20xmlns:gml%3D%22http:%2F%2Fwww.opengis.net%2Fgml%22%3E%3CAnd%3E%3CPropertyIsEqualTo%3E%3CPropertyName%3Estr%3C%2FPropertyName%3E%3CLiteral%3Estr%3C%2FLiteral%3E%3C%2FPropertyIsEqualTo%3E%3CBBOX%3E%3CPropertyName%3Eshape%3C%2FPropertyName%3E%3Cgml:Box%3E%3Cgml:coordinates%3E48.0000000000000000,1.0000000000000000%2050.0000000000000000,3.0000000000000000%3C%2Fgml:coordinates%3E%3C%2Fgml:Box%3E%3C%2FBBOX%3E%3C%2FAnd%3E%3C%2FFilter%3E",
-        """<wfs:FeatureCollection xmlns:xs="http://www.w3.org/2001/XMLSchema"
-xmlns:ogc="http://www.opengis.net/ogc"
-xmlns:foo="http://foo"
-xmlns:wfs="http://www.opengis.net/wfs"
-xmlns:ows="http://www.opengis.net/ows"
-xmlns:xlink="http://www.w3.org/1999/xlink"
-xmlns:gml="http://www.opengis.net/gml"
-xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
-numberOfFeatures="1"
-timeStamp="2015-04-17T14:14:24.859Z"
-xsi:schemaLocation="http://foo /vsimem/wfs_endpoint?SERVICE=WFS&amp;VERSION=1.1.0&amp;REQUEST=DescribeFeatureType&amp;TYPENAME=my_layer
-                    http://www.opengis.net/wfs http://schemas.opengis.net/wfs/1.1.0/wfs.xsd">
-    <gml:featureMembers>
-        <foo:my_layer gml:id="my_layer.1">
-            <foo:str>str</foo:str>
-            <foo:boolean>true</foo:boolean>
-            <foo:short>1</foo:short>
-            <foo:int>123456789</foo:int>
-            <foo:float>1.2</foo:float>
-            <foo:double>1.23</foo:double>
-            <foo:dt>2015-04-17T12:34:56Z</foo:dt>
-            <foo:shape>
-                <gml:Point srsDimension="2" srsName="urn:ogc:def:crs:EPSG::4326">
-                    <gml:pos>49 2</gml:pos>
-                </gml:Point>
-            </foo:shape>
-        </foo:my_layer>
-    </gml:featureMembers>
-</wfs:FeatureCollection>
-""",
+        "/vsimem/wfs_endpoint?SERVICE=WFS&VERSION=1.1.0&REQUEST=GetFeature&TYPENAME=my_layer&FILTER="
+        + _urlescape(
+            '<Filter xmlns="http://www.opengis.net/ogc" xmlns:gml="http://www.opengis.net/gml"><And><PropertyIsEqualTo><PropertyName>str</PropertyName><Literal>str</Literal></PropertyIsEqualTo><BBOX><PropertyName>shape</PropertyName><gml:Box><gml:coordinates>48.0000000000000000,1.0000000000000000 50.0000000000000000,3.0000000000000000</gml:coordinates></gml:Box></BBOX></And></Filter>'
+        ),
+        _xml("get_feature_my_layer.xml"),
     ):
         lyr.SetSpatialFilterRect(1, 48, 3, 50)
         lyr.SetAttributeFilter("str = 'str'")
@@ -2619,11 +2384,8 @@ xsi:schemaLocation="http://foo /vsimem/wfs_endpoint?SERVICE=WFS&amp;VERSION=1.1.
 ###############################################################################
 
 
-@pytest.fixture()
-def wfs110_onelayer_get_caps_transaction():
-    with gdaltest.tempfile(
-        "/vsimem/wfs_endpoint?SERVICE=WFS&REQUEST=GetCapabilities",
-        """<WFS_Capabilities version="1.1.0">
+_CAPS_TRANSACTION_XML = (
+    """<WFS_Capabilities version="1.1.0">
     <OperationsMetadata>
         <ows:Operation name="Transaction">
             <ows:DCP>
@@ -2644,53 +2406,17 @@ def wfs110_onelayer_get_caps_transaction():
             </ows:WGS84BoundingBox>
         </FeatureType>
     </FeatureTypeList>
-  <ogc:Filter_Capabilities>
-    <ogc:Spatial_Capabilities>
-      <ogc:GeometryOperands>
-        <ogc:GeometryOperand>gml:Envelope</ogc:GeometryOperand>
-        <ogc:GeometryOperand>gml:Point</ogc:GeometryOperand>
-        <ogc:GeometryOperand>gml:LineString</ogc:GeometryOperand>
-        <ogc:GeometryOperand>gml:Polygon</ogc:GeometryOperand>
-      </ogc:GeometryOperands>
-      <ogc:SpatialOperators>
-        <ogc:SpatialOperator name="Disjoint"/>
-        <ogc:SpatialOperator name="Equals"/>
-        <ogc:SpatialOperator name="DWithin"/>
-        <ogc:SpatialOperator name="Beyond"/>
-        <ogc:SpatialOperator name="Intersects"/>
-        <ogc:SpatialOperator name="Touches"/>
-        <ogc:SpatialOperator name="Crosses"/>
-        <ogc:SpatialOperator name="Within"/>
-        <ogc:SpatialOperator name="Contains"/>
-        <ogc:SpatialOperator name="Overlaps"/>
-        <ogc:SpatialOperator name="BBOX"/>
-      </ogc:SpatialOperators>
-    </ogc:Spatial_Capabilities>
-    <ogc:Scalar_Capabilities>
-      <ogc:LogicalOperators/>
-      <ogc:ComparisonOperators>
-        <ogc:ComparisonOperator>LessThan</ogc:ComparisonOperator>
-        <ogc:ComparisonOperator>GreaterThan</ogc:ComparisonOperator>
-        <ogc:ComparisonOperator>LessThanEqualTo</ogc:ComparisonOperator>
-        <ogc:ComparisonOperator>GreaterThanEqualTo</ogc:ComparisonOperator>
-        <ogc:ComparisonOperator>EqualTo</ogc:ComparisonOperator>
-        <ogc:ComparisonOperator>NotEqualTo</ogc:ComparisonOperator>
-        <ogc:ComparisonOperator>Like</ogc:ComparisonOperator>
-        <ogc:ComparisonOperator>Between</ogc:ComparisonOperator>
-        <ogc:ComparisonOperator>NullCheck</ogc:ComparisonOperator>
-      </ogc:ComparisonOperators>
-      <ogc:ArithmeticOperators>
-        <ogc:SimpleArithmetic/>
-        <ogc:Functions/>
-      </ogc:ArithmeticOperators>
-    </ogc:Scalar_Capabilities>
-    <ogc:Id_Capabilities>
-      <ogc:FID/>
-      <ogc:EID/>
-    </ogc:Id_Capabilities>
-  </ogc:Filter_Capabilities>
-</WFS_Capabilities>
-""",
+"""
+    + _OGC_FILTER_CAPABILITIES_XML
+    + "</WFS_Capabilities>\n"
+)
+
+
+@pytest.fixture(scope="module")
+def wfs110_onelayer_get_caps_transaction():
+    with gdaltest.tempfile(
+        "/vsimem/wfs_endpoint?SERVICE=WFS&REQUEST=GetCapabilities",
+        _CAPS_TRANSACTION_XML,
     ):
         yield
 
@@ -3224,7 +2950,10 @@ def test_ogr_wfs_vsimem_wfs110_deletefeature(
     assert ret != 0, gdal.GetLastErrorMsg()
 
     with gdaltest.tempfile(
-        "/vsimem/wfs_endpoint?SERVICE=WFS&VERSION=1.1.0&REQUEST=GetFeature&TYPENAME=my_layer&FILTER=%3CFilter%20xmlns%3D%22http:%2F%2Fwww.opengis.net%2Fogc%22%20xmlns:gml%3D%22http:%2F%2Fwww.opengis.net%2Fgml%22%3E%3CGmlObjectId%20id%3D%22my_layer.200%22%2F%3E%3C%2FFilter%3E",
+        "/vsimem/wfs_endpoint?SERVICE=WFS&VERSION=1.1.0&REQUEST=GetFeature&TYPENAME=my_layer&FILTER="
+        + _urlescape(
+            '<Filter xmlns="http://www.opengis.net/ogc" xmlns:gml="http://www.opengis.net/gml"><GmlObjectId id="my_layer.200"/></Filter>'
+        ),
         """<wfs:FeatureCollection xmlns:xs="http://www.w3.org/2001/XMLSchema"
 xmlns:ogc="http://www.opengis.net/ogc"
 xmlns:foo="http://foo"
@@ -3714,11 +3443,43 @@ xsi:schemaLocation="http://ns1 /vsimem/wfs_endpoint?SERVICE=WFS&amp;VERSION=2.0.
 ###############################################################################
 
 
+# DescribeFeatureType response shared by the wfs200 paging and json tests.
+_SCHEMA_MY_LAYER_XML = """<xsd:schema xmlns:foo="http://foo" xmlns:gml="http://www.opengis.net/gml" xmlns:xsd="http://www.w3.org/2001/XMLSchema" elementFormDefault="qualified" targetNamespace="http://foo">
+  <xsd:import namespace="http://www.opengis.net/gml" schemaLocation="http://foo/schemas/gml/3.2.1/base/gml.xsd"/>
+  <xsd:complexType name="my_layerType">
+    <xsd:complexContent>
+      <xsd:extension base="gml:AbstractFeatureType">
+        <xsd:sequence>
+          <xsd:element maxOccurs="1" minOccurs="0" name="str" nillable="true" type="xsd:string"/>
+          <xsd:element maxOccurs="1" minOccurs="0" name="boolean" nillable="true" type="xsd:boolean"/>
+          <xsd:element maxOccurs="1" minOccurs="0" name="short" nillable="true" type="xsd:short"/>
+          <xsd:element maxOccurs="1" minOccurs="0" name="int" nillable="true" type="xsd:int"/>
+          <xsd:element maxOccurs="1" minOccurs="0" name="float" nillable="true" type="xsd:float"/>
+          <xsd:element maxOccurs="1" minOccurs="0" name="double" nillable="true" type="xsd:double"/>
+          <xsd:element maxOccurs="1" minOccurs="0" name="dt" nillable="true" type="xsd:dateTime"/>
+          <xsd:element maxOccurs="1" minOccurs="0" name="shape" nillable="true" type="gml:PointPropertyType"/>
+        </xsd:sequence>
+      </xsd:extension>
+    </xsd:complexContent>
+  </xsd:complexType>
+  <xsd:element name="my_layer" substitutionGroup="gml:_Feature" type="foo:my_layerType"/>
+</xsd:schema>
+"""
+
+# The paged GetFeature requests below only differ by their STARTINDEX, so
+# share the common prefix instead of repeating the full URL per page.
+_wfs200_paging_endpoint = "/vsimem/wfs200_endpoint_paging"
+_wfs200_paging_getfeature = (
+    _wfs200_paging_endpoint
+    + "?SERVICE=WFS&VERSION=2.0.0&REQUEST=GetFeature&TYPENAMES=my_layer"
+)
+
+
 @pytest.mark.parametrize("numberMatched", ["unknown", "4"])
 def test_ogr_wfs_vsimem_wfs200_paging(with_and_without_streaming, numberMatched):
 
     with gdaltest.tempfile(
-        "/vsimem/wfs200_endpoint_paging?SERVICE=WFS&REQUEST=GetCapabilities",
+        _wfs200_paging_endpoint + "?SERVICE=WFS&REQUEST=GetCapabilities",
         """<WFS_Capabilities version="2.0.0">
     <OperationsMetadata>
         <ows:Operation name="GetFeature">
@@ -3746,100 +3507,28 @@ def test_ogr_wfs_vsimem_wfs200_paging(with_and_without_streaming, numberMatched)
             </ows:WGS84BoundingBox>
         </FeatureType>
     </FeatureTypeList>
-  <ogc:Filter_Capabilities>
-    <ogc:Spatial_Capabilities>
-      <ogc:GeometryOperands>
-        <ogc:GeometryOperand>gml:Envelope</ogc:GeometryOperand>
-        <ogc:GeometryOperand>gml:Point</ogc:GeometryOperand>
-        <ogc:GeometryOperand>gml:LineString</ogc:GeometryOperand>
-        <ogc:GeometryOperand>gml:Polygon</ogc:GeometryOperand>
-      </ogc:GeometryOperands>
-      <ogc:SpatialOperators>
-        <ogc:SpatialOperator name="Disjoint"/>
-        <ogc:SpatialOperator name="Equals"/>
-        <ogc:SpatialOperator name="DWithin"/>
-        <ogc:SpatialOperator name="Beyond"/>
-        <ogc:SpatialOperator name="Intersects"/>
-        <ogc:SpatialOperator name="Touches"/>
-        <ogc:SpatialOperator name="Crosses"/>
-        <ogc:SpatialOperator name="Within"/>
-        <ogc:SpatialOperator name="Contains"/>
-        <ogc:SpatialOperator name="Overlaps"/>
-        <ogc:SpatialOperator name="BBOX"/>
-      </ogc:SpatialOperators>
-    </ogc:Spatial_Capabilities>
-    <ogc:Scalar_Capabilities>
-      <ogc:LogicalOperators/>
-      <ogc:ComparisonOperators>
-        <ogc:ComparisonOperator>LessThan</ogc:ComparisonOperator>
-        <ogc:ComparisonOperator>GreaterThan</ogc:ComparisonOperator>
-        <ogc:ComparisonOperator>LessThanEqualTo</ogc:ComparisonOperator>
-        <ogc:ComparisonOperator>GreaterThanEqualTo</ogc:ComparisonOperator>
-        <ogc:ComparisonOperator>EqualTo</ogc:ComparisonOperator>
-        <ogc:ComparisonOperator>NotEqualTo</ogc:ComparisonOperator>
-        <ogc:ComparisonOperator>Like</ogc:ComparisonOperator>
-        <ogc:ComparisonOperator>Between</ogc:ComparisonOperator>
-        <ogc:ComparisonOperator>NullCheck</ogc:ComparisonOperator>
-      </ogc:ComparisonOperators>
-      <ogc:ArithmeticOperators>
-        <ogc:SimpleArithmetic/>
-        <ogc:Functions/>
-      </ogc:ArithmeticOperators>
-    </ogc:Scalar_Capabilities>
-    <ogc:Id_Capabilities>
-      <ogc:FID/>
-      <ogc:EID/>
-    </ogc:Id_Capabilities>
-  </ogc:Filter_Capabilities>
-</WFS_Capabilities>
-""",
+"""
+        + _OGC_FILTER_CAPABILITIES_XML
+        + "</WFS_Capabilities>\n",
     ):
-        ds = ogr.Open("WFS:/vsimem/wfs200_endpoint_paging")
+        ds = ogr.Open("WFS:" + _wfs200_paging_endpoint)
     lyr = ds.GetLayer(0)
     assert lyr.GetMetadata() == {
         "ABSTRACT": "abstract",
-        "KEYWORD_1": "keyword",
-        "TITLE": "title",
-    }
-
-    with gdaltest.tempfile(
-        "/vsimem/wfs200_endpoint_paging?SERVICE=WFS&VERSION=2.0.0&REQUEST=DescribeFeatureType&TYPENAME=my_layer",
-        """<xsd:schema xmlns:foo="http://foo" xmlns:gml="http://www.opengis.net/gml" xmlns:xsd="http://www.w3.org/2001/XMLSchema" elementFormDefault="qualified" targetNamespace="http://foo">
-  <xsd:import namespace="http://www.opengis.net/gml" schemaLocation="http://foo/schemas/gml/3.2.1/base/gml.xsd"/>
-  <xsd:complexType name="my_layerType">
-    <xsd:complexContent>
-      <xsd:extension base="gml:AbstractFeatureType">
-        <xsd:sequence>
-          <xsd:element maxOccurs="1" minOccurs="0" name="str" nillable="true" type="xsd:string"/>
-          <xsd:element maxOccurs="1" minOccurs="0" name="boolean" nillable="true" type="xsd:boolean"/>
-          <xsd:element maxOccurs="1" minOccurs="0" name="short" nillable="true" type="xsd:short"/>
-          <xsd:element maxOccurs="1" minOccurs="0" name="int" nillable="true" type="xsd:int"/>
-          <xsd:element maxOccurs="1" minOccurs="0" name="float" nillable="true" type="xsd:float"/>
-          <xsd:element maxOccurs="1" minOccurs="0" name="double" nillable="true" type="xsd:double"/>
-          <xsd:element maxOccurs="1" minOccurs="0" name="dt" nillable="true" type="xsd:dateTime"/>
-          <xsd:element maxOccurs="1" minOccurs="0" name="shape" nillable="true" type="gml:PointPropertyType"/>
-        </xsd:sequence>
-      </xsd:extension>
-    </xsd:complexContent>
-  </xsd:complexType>
-  <xsd:element name="my_layer" substitutionGroup="gml:_Feature" type="foo:my_layerType"/>
-</xsd:schema>
-""",
-    ), gdaltest.tempfile(
-        "/vsimem/wfs200_endpoint_paging?SERVICE=WFS&VERSION=2.0.0&REQUEST=GetFeature&TYPENAMES=my_layer&STARTINDEX=0&COUNT=2",
-        f"""<wfs:FeatureCollection xmlns:xs="http://www.w3.org/2001/XMLSchema"
-xmlns:ogc="http://www.opengis.net/ogc"
-xmlns:foo="http://foo"
-xmlns:wfs="http://www.opengis.net/wfs"
-xmlns:ows="http://www.opengis.net/ows"
-xmlns:xlink="http://www.w3.org/1999/xlink"
-xmlns:gml="http://www.opengis.net/gml"
-xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
-numberMatched="{numberMatched}" numberReturned="2"
-timeStamp="2015-04-17T14:14:24.859Z"
-xsi:schemaLocation="http://foo /vsimem/wfs_endpoint?SERVICE=WFS&amp;VERSION=2.0.0&amp;REQUEST=DescribeFeatureType&amp;TYPENAME=my_layer
-                    http://www.opengis.net/wfs/2.0 http://schemas.opengis.net/wfs/2.0/wfs.xsd">
-    <gml:featureMembers>
+        "KEYWORD_1": "keyword",
+        "TITLE": "title",
+    }
+
+    with gdaltest.tempfile(
+        _wfs200_paging_endpoint
+        + "?SERVICE=WFS&VERSION=2.0.0&REQUEST=DescribeFeatureType&TYPENAME=my_layer",
+        _SCHEMA_MY_LAYER_XML,
+    ), gdaltest.tempfile(
+        _wfs200_paging_getfeature + "&STARTINDEX=0&COUNT=2",
+        make_wfs200_page_xml(
+            numberMatched,
+            2,
+            """    <gml:featureMembers>
         <foo:my_layer gml:id="my_layer.1">
             <foo:str>str</foo:str>
             <foo:boolean>true</foo:boolean>
@@ -3859,48 +3548,31 @@ xsi:schemaLocation="http://foo /vsimem/wfs_endpoint?SERVICE=WFS&amp;VERSION=2.0.
         <foo:my_layer gml:id="my_layer.2">
         </foo:my_layer>
     </gml:featureMembers>
-</wfs:FeatureCollection>
 """,
+            dft_version="2.0.0",
+        ),
     ), gdaltest.tempfile(
-        "/vsimem/wfs200_endpoint_paging?SERVICE=WFS&VERSION=2.0.0&REQUEST=GetFeature&TYPENAMES=my_layer&STARTINDEX=2&COUNT=2",
-        f"""<wfs:FeatureCollection xmlns:xs="http://www.w3.org/2001/XMLSchema"
-xmlns:ogc="http://www.opengis.net/ogc"
-xmlns:foo="http://foo"
-xmlns:wfs="http://www.opengis.net/wfs"
-xmlns:ows="http://www.opengis.net/ows"
-xmlns:xlink="http://www.w3.org/1999/xlink"
-xmlns:gml="http://www.opengis.net/gml"
-xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
-numberMatched="{numberMatched}" numberReturned="1"
-timeStamp="2015-04-17T14:14:24.859Z"
-xsi:schemaLocation="http://foo /vsimem/wfs_endpoint?SERVICE=WFS&amp;VERSION=1.1.0&amp;REQUEST=DescribeFeatureType&amp;TYPENAME=my_layer
-                    http://www.opengis.net/wfs/2.0 http://schemas.opengis.net/wfs/2.0/wfs.xsd">
-    <gml:featureMembers>
+        _wfs200_paging_getfeature + "&STARTINDEX=2&COUNT=2",
+        make_wfs200_page_xml(
+            numberMatched,
+            1,
+            """    <gml:featureMembers>
         <foo:my_layer gml:id="my_layer.3">
         </foo:my_layer>
     </gml:featureMembers>
-</wfs:FeatureCollection>
 """,
+        ),
     ), gdaltest.tempfile(
-        "/vsimem/wfs200_endpoint_paging?SERVICE=WFS&VERSION=2.0.0&REQUEST=GetFeature&TYPENAMES=my_layer&STARTINDEX=3&COUNT=2",
-        f"""<wfs:FeatureCollection xmlns:xs="http://www.w3.org/2001/XMLSchema"
-xmlns:ogc="http://www.opengis.net/ogc"
-xmlns:foo="http://foo"
-xmlns:wfs="http://www.opengis.net/wfs"
-xmlns:ows="http://www.opengis.net/ows"
-xmlns:xlink="http://www.w3.org/1999/xlink"
-xmlns:gml="http://www.opengis.net/gml"
-xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
-numberMatched="{numberMatched}" numberReturned="1"
-timeStamp="2015-04-17T14:14:24.859Z"
-xsi:schemaLocation="http://foo /vsimem/wfs_endpoint?SERVICE=WFS&amp;VERSION=1.1.0&amp;REQUEST=DescribeFeatureType&amp;TYPENAME=my_layer
-                    http://www.opengis.net/wfs/2.0 http://schemas.opengis.net/wfs/2.0/wfs.xsd">
-    <gml:featureMembers>
+        _wfs200_paging_getfeature + "&STARTINDEX=3&COUNT=2",
+        make_wfs200_page_xml(
+            numberMatched,
+            1,
+            """    <gml:featureMembers>
         <foo:my_layer gml:id="my_layer.4">
         </foo:my_layer>
     </gml:featureMembers>
-</wfs:FeatureCollection>
 """,
+        ),
     ):
         f = lyr.GetNextFeature()
         assert f is not None
@@ -3931,21 +3603,8 @@ xsi:schemaLocation="http://foo /vsimem/wfs_endpoint?SERVICE=WFS&amp;VERSION=1.1.
 
         if numberMatched == "unknown":
             with gdaltest.tempfile(
-                "/vsimem/wfs200_endpoint_paging?SERVICE=WFS&VERSION=2.0.0&REQUEST=GetFeature&TYPENAMES=my_layer&STARTINDEX=4&COUNT=2",
-                """<wfs:FeatureCollection xmlns:xs="http://www.w3.org/2001/XMLSchema"
-xmlns:ogc="http://www.opengis.net/ogc"
-xmlns:foo="http://foo"
-xmlns:wfs="http://www.opengis.net/wfs"
-xmlns:ows="http://www.opengis.net/ows"
-xmlns:xlink="http://www.w3.org/1999/xlink"
-xmlns:gml="http://www.opengis.net/gml"
-xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
-numberMatched="unknown" numberReturned="0"
-timeStamp="2015-04-17T14:14:24.859Z"
-xsi:schemaLocation="http://foo /vsimem/wfs_endpoint?SERVICE=WFS&amp;VERSION=1.1.0&amp;REQUEST=DescribeFeatureType&amp;TYPENAME=my_layer
-                    http://www.opengis.net/wfs/2.0 http://schemas.opengis.net/wfs/2.0/wfs.xsd">
-</wfs:FeatureCollection>
-""",
+                _wfs200_paging_getfeature + "&STARTINDEX=4&COUNT=2",
+                make_wfs200_page_xml("unknown", 0),
             ):
                 f = lyr.GetNextFeature()
                 if f is not None:
@@ -4093,80 +3752,16 @@ def test_ogr_wfs_vsimem_wfs200_json(with_and_without_streaming):
             </ows:WGS84BoundingBox>
         </FeatureType>
     </FeatureTypeList>
-  <ogc:Filter_Capabilities>
-    <ogc:Spatial_Capabilities>
-      <ogc:GeometryOperands>
-        <ogc:GeometryOperand>gml:Envelope</ogc:GeometryOperand>
-        <ogc:GeometryOperand>gml:Point</ogc:GeometryOperand>
-        <ogc:GeometryOperand>gml:LineString</ogc:GeometryOperand>
-        <ogc:GeometryOperand>gml:Polygon</ogc:GeometryOperand>
-      </ogc:GeometryOperands>
-      <ogc:SpatialOperators>
-        <ogc:SpatialOperator name="Disjoint"/>
-        <ogc:SpatialOperator name="Equals"/>
-        <ogc:SpatialOperator name="DWithin"/>
-        <ogc:SpatialOperator name="Beyond"/>
-        <ogc:SpatialOperator name="Intersects"/>
-        <ogc:SpatialOperator name="Touches"/>
-        <ogc:SpatialOperator name="Crosses"/>
-        <ogc:SpatialOperator name="Within"/>
-        <ogc:SpatialOperator name="Contains"/>
-        <ogc:SpatialOperator name="Overlaps"/>
-        <ogc:SpatialOperator name="BBOX"/>
-      </ogc:SpatialOperators>
-    </ogc:Spatial_Capabilities>
-    <ogc:Scalar_Capabilities>
-      <ogc:LogicalOperators/>
-      <ogc:ComparisonOperators>
-        <ogc:ComparisonOperator>LessThan</ogc:ComparisonOperator>
-        <ogc:ComparisonOperator>GreaterThan</ogc:ComparisonOperator>
-        <ogc:ComparisonOperator>LessThanEqualTo</ogc:ComparisonOperator>
-        <ogc:ComparisonOperator>GreaterThanEqualTo</ogc:ComparisonOperator>
-        <ogc:ComparisonOperator>EqualTo</ogc:ComparisonOperator>
-        <ogc:ComparisonOperator>NotEqualTo</ogc:ComparisonOperator>
-        <ogc:ComparisonOperator>Like</ogc:ComparisonOperator>
-        <ogc:ComparisonOperator>Between</ogc:ComparisonOperator>
-        <ogc:ComparisonOperator>NullCheck</ogc:ComparisonOperator>
-      </ogc:ComparisonOperators>
-      <ogc:ArithmeticOperators>
-        <ogc:SimpleArithmetic/>
-        <ogc:Functions/>
-      </ogc:ArithmeticOperators>
-    </ogc:Scalar_Capabilities>
-    <ogc:Id_Capabilities>
-      <ogc:FID/>
-      <ogc:EID/>
-    </ogc:Id_Capabilities>
-  </ogc:Filter_Capabilities>
-</WFS_Capabilities>
-""",
+"""
+        + _OGC_FILTER_CAPABILITIES_XML
+        + "</WFS_Capabilities>\n",
     ):
         ds = ogr.Open("WFS:/vsimem/wfs200_endpoint_json?OUTPUTFORMAT=application/json")
     lyr = ds.GetLayer(0)
 
     with gdaltest.tempfile(
         "/vsimem/wfs200_endpoint_json?SERVICE=WFS&VERSION=2.0.0&REQUEST=DescribeFeatureType&TYPENAME=my_layer",
-        """<xsd:schema xmlns:foo="http://foo" xmlns:gml="http://www.opengis.net/gml" xmlns:xsd="http://www.w3.org/2001/XMLSchema" elementFormDefault="qualified" targetNamespace="http://foo">
-  <xsd:import namespace="http://www.opengis.net/gml" schemaLocation="http://foo/schemas/gml/3.2.1/base/gml.xsd"/>
-  <xsd:complexType name="my_layerType">
-    <xsd:complexContent>
-      <xsd:extension base="gml:AbstractFeatureType">
-        <xsd:sequence>
-          <xsd:element maxOccurs="1" minOccurs="0" name="str" nillable="true" type="xsd:string"/>
-          <xsd:element maxOccurs="1" minOccurs="0" name="boolean" nillable="true" type="xsd:boolean"/>
-          <xsd:element maxOccurs="1" minOccurs="0" name="short" nillable="true" type="xsd:short"/>
-          <xsd:element maxOccurs="1" minOccurs="0" name="int" nillable="true" type="xsd:int"/>
-          <xsd:element maxOccurs="1" minOccurs="0" name="float" nillable="true" type="xsd:float"/>
-          <xsd:element maxOccurs="1" minOccurs="0" name="double" nillable="true" type="xsd:double"/>
-          <xsd:element maxOccurs="1" minOccurs="0" name="dt" nillable="true" type="xsd:dateTime"/>
-          <xsd:element maxOccurs="1" minOccurs="0" name="shape" nillable="true" type="gml:PointPropertyType"/>
-        </xsd:sequence>
-      </xsd:extension>
-    </xsd:complexContent>
-  </xsd:complexType>
-  <xsd:element name="my_layer" substitutionGroup="gml:_Feature" type="foo:my_layerType"/>
-</xsd:schema>
-""",
+        _SCHEMA_MY_LAYER_XML,
     ), gdaltest.tempfile(
         "/vsimem/wfs200_endpoint_json?OUTPUTFORMAT=application/json&SERVICE=WFS&VERSION=2.0.0&REQUEST=GetFeature&TYPENAMES=my_layer&STARTINDEX=0&COUNT=2",
         """{"type":"FeatureCollection",
@@ -4185,9 +3780,10 @@ def test_ogr_wfs_vsimem_wfs200_json(with_and_without_streaming):
         f = lyr.GetNextFeature()
         assert f is not None
         # We currently invert... A bit weird. See comment in code. Probably inappropriate
-        if f.str != "str" or f.GetGeometryRef().ExportToWkt() != "POINT (49 2)":
+        if f.str != "str":
             f.DumpReadable()
             pytest.fail()
+        ogrtest.check_feature_geometry(f, "POINT (49 2)")
 
         f = lyr.GetNextFeature()
         if f is not None:
@@ -4262,9 +3858,10 @@ Content-Disposition: attachment; filename=my.json
             f = lyr.GetNextFeature()
             assert f is not None
             # We currently invert... A bit weird. See comment in code. Probably inappropriate
-            if f.str != "str" or f.GetGeometryRef().ExportToWkt() != "POINT (49 2)":
+            if f.str != "str":
                 f.DumpReadable()
                 pytest.fail()
+            ogrtest.check_feature_geometry(f, "POINT (49 2)")
 
             ds = ogr.Open(
                 "WFS:/vsimem/wfs200_endpoint_multipart?OUTPUTFORMAT=multipart"
@@ -4321,14 +3918,55 @@ str,"POINT(2 49)"
                 f = lyr.GetNextFeature()
                 assert f is not None
                 # We currently invert... A bit weird. See comment in code. Probably inappropriate
-                if f.str != "str" or f.GetGeometryRef().ExportToWkt() != "POINT (49 2)":
+                if f.str != "str":
                     f.DumpReadable()
                     pytest.fail()
+                ogrtest.check_feature_geometry(f, "POINT (49 2)")
 
 
 ###############################################################################
 
 
+# GetFeature URL pieces shared by the wfs200 join tests below: the requests
+# only differ by their STARTINDEX/COUNT/RESULTTYPE parameters, while the
+# join filter is always the same.
+_wfs200_join_getfeature = "/vsimem/wfs200_endpoint_join?SERVICE=WFS&VERSION=2.0.0&REQUEST=GetFeature&TYPENAMES=%28lyr1,lyr2%29"
+_wfs200_join_filter = _urlescape(
+    '<Filter xmlns="http://www.opengis.net/fes/2.0" xmlns:gml="http://www.opengis.net/gml/3.2"><PropertyIsEqualTo><ValueReference>lyr1/str</ValueReference><ValueReference>lyr2/str2</ValueReference></PropertyIsEqualTo></Filter>'
+)
+_wfs200_join_filter_ns = _urlescape(
+    '<Filter xmlns="http://www.opengis.net/fes/2.0" xmlns:foo="http://foo" xmlns:gml="http://www.opengis.net/gml/3.2"><PropertyIsEqualTo><ValueReference>foo:lyr1/str</ValueReference><ValueReference>foo:lyr2/str2</ValueReference></PropertyIsEqualTo></Filter>'
+)
+
+# DescribeFeatureType response shared by the wfs200 join tests.
+_SCHEMA_LYR1_LYR2_XML = """<xsd:schema xmlns:foo="http://foo" xmlns:gml="http://www.opengis.net/gml" xmlns:xsd="http://www.w3.org/2001/XMLSchema" elementFormDefault="qualified" targetNamespace="http://foo">
+  <xsd:import namespace="http://www.opengis.net/gml" schemaLocation="http://foo/schemas/gml/3.2.1/base/gml.xsd"/>
+  <xsd:complexType name="lyr1Type">
+    <xsd:complexContent>
+      <xsd:extension base="gml:AbstractFeatureType">
+        <xsd:sequence>
+          <xsd:element maxOccurs="1" minOccurs="0" name="str" nillable="true" type="xsd:string"/>
+          <xsd:element maxOccurs="1" minOccurs="0" name="shape" nillable="true" type="gml:PointPropertyType"/>
+        </xsd:sequence>
+      </xsd:extension>
+    </xsd:complexContent>
+  </xsd:complexType>
+  <xsd:element name="lyr1" substitutionGroup="gml:_Feature" type="foo:lyr1Type"/>
+  <xsd:complexType name="lyr2Type">
+    <xsd:complexContent>
+      <xsd:extension base="gml:AbstractFeatureType">
+        <xsd:sequence>
+          <xsd:element maxOccurs="1" minOccurs="0" name="str2" nillable="true" type="xsd:string"/>
+          <xsd:element maxOccurs="1" minOccurs="0" name="another_shape" nillable="true" type="gml:PointPropertyType"/>
+        </xsd:sequence>
+      </xsd:extension>
+    </xsd:complexContent>
+  </xsd:complexType>
+  <xsd:element name="lyr2" substitutionGroup="gml:_Feature" type="foo:lyr2Type"/>
+</xsd:schema>
+"""
+
+
 def test_ogr_wfs_vsimem_wfs200_join(with_and_without_streaming):
 
     with gdaltest.tempfile(
@@ -4370,32 +4008,7 @@ def test_ogr_wfs_vsimem_wfs200_join(with_and_without_streaming):
 """,
     ), gdaltest.tempfile(
         "/vsimem/wfs200_endpoint_join?SERVICE=WFS&VERSION=2.0.0&REQUEST=DescribeFeatureType&TYPENAME=lyr1,lyr2",
-        """<xsd:schema xmlns:foo="http://foo" xmlns:gml="http://www.opengis.net/gml" xmlns:xsd="http://www.w3.org/2001/XMLSchema" elementFormDefault="qualified" targetNamespace="http://foo">
-  <xsd:import namespace="http://www.opengis.net/gml" schemaLocation="http://foo/schemas/gml/3.2.1/base/gml.xsd"/>
-  <xsd:complexType name="lyr1Type">
-    <xsd:complexContent>
-      <xsd:extension base="gml:AbstractFeatureType">
-        <xsd:sequence>
-          <xsd:element maxOccurs="1" minOccurs="0" name="str" nillable="true" type="xsd:string"/>
-          <xsd:element maxOccurs="1" minOccurs="0" name="shape" nillable="true" type="gml:PointPropertyType"/>
-        </xsd:sequence>
-      </xsd:extension>
-    </xsd:complexContent>
-  </xsd:complexType>
-  <xsd:element name="lyr1" substitutionGroup="gml:_Feature" type="foo:lyr1Type"/>
-  <xsd:complexType name="lyr2Type">
-    <xsd:complexContent>
-      <xsd:extension base="gml:AbstractFeatureType">
-        <xsd:sequence>
-          <xsd:element maxOccurs="1" minOccurs="0" name="str2" nillable="true" type="xsd:string"/>
-          <xsd:element maxOccurs="1" minOccurs="0" name="another_shape" nillable="true" type="gml:PointPropertyType"/>
-        </xsd:sequence>
-      </xsd:extension>
-    </xsd:complexContent>
-  </xsd:complexType>
-  <xsd:element name="lyr2" substitutionGroup="gml:_Feature" type="foo:lyr2Type"/>
-</xsd:schema>
-""",
+        _SCHEMA_LYR1_LYR2_XML,
     ):
         ds = ogr.Open("WFS:/vsimem/wfs200_endpoint_join")
         with ds.ExecuteSQL(
@@ -4409,7 +4022,9 @@ def test_ogr_wfs_vsimem_wfs200_join(with_and_without_streaming):
         with ds.ExecuteSQL(
             "SELECT * FROM lyr1 JOIN lyr2 ON lyr1.str = lyr2.str2"
         ) as sql_lyr, gdaltest.tempfile(
-            "/vsimem/wfs200_endpoint_join?SERVICE=WFS&VERSION=2.0.0&REQUEST=GetFeature&TYPENAMES=%28lyr1,lyr2%29&STARTINDEX=0&COUNT=1&FILTER=%3CFilter%20xmlns%3D%22http:%2F%2Fwww.opengis.net%2Ffes%2F2.0%22%20xmlns:gml%3D%22http:%2F%2Fwww.opengis.net%2Fgml%2F3.2%22%3E%3CPropertyIsEqualTo%3E%3CValueReference%3Elyr1%2Fstr%3C%2FValueReference%3E%3CValueReference%3Elyr2%2Fstr2%3C%2FValueReference%3E%3C%2FPropertyIsEqualTo%3E%3C%2FFilter%3E",
+            _wfs200_join_getfeature
+            + "&STARTINDEX=0&COUNT=1&FILTER="
+            + _wfs200_join_filter,
             """""",
         ):
             with gdal.quiet_errors():
@@ -4423,7 +4038,9 @@ def test_ogr_wfs_vsimem_wfs200_join(with_and_without_streaming):
         with ds.ExecuteSQL(
             "SELECT * FROM lyr1 JOIN lyr2 ON lyr1.str = lyr2.str2"
         ) as sql_lyr, gdaltest.tempfile(
-            "/vsimem/wfs200_endpoint_join?SERVICE=WFS&VERSION=2.0.0&REQUEST=GetFeature&TYPENAMES=%28lyr1,lyr2%29&STARTINDEX=0&COUNT=1&FILTER=%3CFilter%20xmlns%3D%22http:%2F%2Fwww.opengis.net%2Ffes%2F2.0%22%20xmlns:gml%3D%22http:%2F%2Fwww.opengis.net%2Fgml%2F3.2%22%3E%3CPropertyIsEqualTo%3E%3CValueReference%3Elyr1%2Fstr%3C%2FValueReference%3E%3CValueReference%3Elyr2%2Fstr2%3C%2FValueReference%3E%3C%2FPropertyIsEqualTo%3E%3C%2FFilter%3E",
+            _wfs200_join_getfeature
+            + "&STARTINDEX=0&COUNT=1&FILTER="
+            + _wfs200_join_filter,
             """<ServiceExceptionReport/>""",
         ):
             with gdal.quiet_errors():
@@ -4437,7 +4054,9 @@ def test_ogr_wfs_vsimem_wfs200_join(with_and_without_streaming):
         with ds.ExecuteSQL(
             "SELECT * FROM lyr1 JOIN lyr2 ON lyr1.str = lyr2.str2"
         ) as sql_lyr, gdaltest.tempfile(
-            "/vsimem/wfs200_endpoint_join?SERVICE=WFS&VERSION=2.0.0&REQUEST=GetFeature&TYPENAMES=%28lyr1,lyr2%29&STARTINDEX=0&COUNT=1&FILTER=%3CFilter%20xmlns%3D%22http:%2F%2Fwww.opengis.net%2Ffes%2F2.0%22%20xmlns:gml%3D%22http:%2F%2Fwww.opengis.net%2Fgml%2F3.2%22%3E%3CPropertyIsEqualTo%3E%3CValueReference%3Elyr1%2Fstr%3C%2FValueReference%3E%3CValueReference%3Elyr2%2Fstr2%3C%2FValueReference%3E%3C%2FPropertyIsEqualTo%3E%3C%2FFilter%3E",
+            _wfs200_join_getfeature
+            + "&STARTINDEX=0&COUNT=1&FILTER="
+            + _wfs200_join_filter,
             """<invalid_xml""",
         ):
             with gdal.quiet_errors():
@@ -4448,7 +4067,9 @@ def test_ogr_wfs_vsimem_wfs200_join(with_and_without_streaming):
         with ds.ExecuteSQL(
             "SELECT * FROM lyr1 JOIN lyr2 ON lyr1.str = lyr2.str2"
         ) as sql_lyr, gdaltest.tempfile(
-            "/vsimem/wfs200_endpoint_join?SERVICE=WFS&VERSION=2.0.0&REQUEST=GetFeature&TYPENAMES=%28lyr1,lyr2%29&STARTINDEX=0&COUNT=1&FILTER=%3CFilter%20xmlns%3D%22http:%2F%2Fwww.opengis.net%2Ffes%2F2.0%22%20xmlns:gml%3D%22http:%2F%2Fwww.opengis.net%2Fgml%2F3.2%22%3E%3CPropertyIsEqualTo%3E%3CValueReference%3Elyr1%2Fstr%3C%2FValueReference%3E%3CValueReference%3Elyr2%2Fstr2%3C%2FValueReference%3E%3C%2FPropertyIsEqualTo%3E%3C%2FFilter%3E",
+            _wfs200_join_getfeature
+            + "&STARTINDEX=0&COUNT=1&FILTER="
+            + _wfs200_join_filter,
             """<dummy_xml/>""",
         ):
             with gdal.quiet_errors():
@@ -4457,7 +4078,9 @@ def test_ogr_wfs_vsimem_wfs200_join(with_and_without_streaming):
 
         ds = ogr.Open("WFS:/vsimem/wfs200_endpoint_join")
         with gdaltest.tempfile(
-            "/vsimem/wfs200_endpoint_join?SERVICE=WFS&VERSION=2.0.0&REQUEST=GetFeature&TYPENAMES=%28lyr1,lyr2%29&STARTINDEX=0&COUNT=1&FILTER=%3CFilter%20xmlns%3D%22http:%2F%2Fwww.opengis.net%2Ffes%2F2.0%22%20xmlns:gml%3D%22http:%2F%2Fwww.opengis.net%2Fgml%2F3.2%22%3E%3CPropertyIsEqualTo%3E%3CValueReference%3Elyr1%2Fstr%3C%2FValueReference%3E%3CValueReference%3Elyr2%2Fstr2%3C%2FValueReference%3E%3C%2FPropertyIsEqualTo%3E%3C%2FFilter%3E",
+            _wfs200_join_getfeature
+            + "&STARTINDEX=0&COUNT=1&FILTER="
+            + _wfs200_join_filter,
             """<?xml version="1.0" encoding="UTF-8"?>
 <wfs:FeatureCollection xmlns:xs="http://www.w3.org/2001/XMLSchema"
     xmlns:foo="http://foo"
@@ -4487,7 +4110,9 @@ def test_ogr_wfs_vsimem_wfs200_join(with_and_without_streaming):
 </wfs:FeatureCollection>
 """,
         ), gdaltest.tempfile(
-            "/vsimem/wfs200_endpoint_join?SERVICE=WFS&VERSION=2.0.0&REQUEST=GetFeature&TYPENAMES=%28lyr1,lyr2%29&STARTINDEX=1&COUNT=1&FILTER=%3CFilter%20xmlns%3D%22http:%2F%2Fwww.opengis.net%2Ffes%2F2.0%22%20xmlns:gml%3D%22http:%2F%2Fwww.opengis.net%2Fgml%2F3.2%22%3E%3CPropertyIsEqualTo%3E%3CValueReference%3Elyr1%2Fstr%3C%2FValueReference%3E%3CValueReference%3Elyr2%2Fstr2%3C%2FValueReference%3E%3C%2FPropertyIsEqualTo%3E%3C%2FFilter%3E",
+            _wfs200_join_getfeature
+            + "&STARTINDEX=1&COUNT=1&FILTER="
+            + _wfs200_join_filter,
             """<?xml version="1.0" encoding="UTF-8"?>
 <wfs:FeatureCollection xmlns:xs="http://www.w3.org/2001/XMLSchema"
     xmlns:foo="http://foo"
@@ -4517,7 +4142,9 @@ def test_ogr_wfs_vsimem_wfs200_join(with_and_without_streaming):
 </wfs:FeatureCollection>
 """,
         ), gdaltest.tempfile(
-            "/vsimem/wfs200_endpoint_join?SERVICE=WFS&VERSION=2.0.0&REQUEST=GetFeature&TYPENAMES=%28lyr1,lyr2%29&STARTINDEX=2&COUNT=1&FILTER=%3CFilter%20xmlns%3D%22http:%2F%2Fwww.opengis.net%2Ffes%2F2.0%22%20xmlns:gml%3D%22http:%2F%2Fwww.opengis.net%2Fgml%2F3.2%22%3E%3CPropertyIsEqualTo%3E%3CValueReference%3Elyr1%2Fstr%3C%2FValueReference%3E%3CValueReference%3Elyr2%2Fstr2%3C%2FValueReference%3E%3C%2FPropertyIsEqualTo%3E%3C%2FFilter%3E",
+            _wfs200_join_getfeature
+            + "&STARTINDEX=2&COUNT=1&FILTER="
+            + _wfs200_join_filter,
             """<?xml version="1.0" encoding="UTF-8"?>
 <wfs:FeatureCollection xmlns:xs="http://www.w3.org/2001/XMLSchema"
     xmlns:foo="http://foo"
@@ -4541,22 +4168,22 @@ def test_ogr_wfs_vsimem_wfs200_join(with_and_without_streaming):
                     or f["lyr1.str"] != "123.4"
                     or f["lyr2.gml_id"] != "lyr2-101"
                     or f["lyr2.str2"] != "123.4"
-                    or f["lyr1.shape"].ExportToWkt() != "POINT (2.5 48.5)"
-                    or f["lyr2.another_shape"].ExportToWkt() != "POINT (2 49)"
                 ):
                     f.DumpReadable()
                     pytest.fail()
+                ogrtest.check_feature_geometry(f["lyr1.shape"], "POINT (2.5 48.5)")
+                ogrtest.check_feature_geometry(f["lyr2.another_shape"], "POINT (2 49)")
                 f = sql_lyr.GetNextFeature()
                 if (
                     f["lyr1.gml_id"] != "lyr1-101"
                     or f["lyr1.str"] != "foo"
                     or f["lyr2.gml_id"] != "lyr2-102"
                     or f["lyr2.str2"] != "foo"
-                    or f["lyr1.shape"].ExportToWkt() != "POINT (2.5 48.5)"
-                    or f["lyr2.another_shape"].ExportToWkt() != "POINT (2 49)"
                 ):
                     f.DumpReadable()
                     pytest.fail()
+                ogrtest.check_feature_geometry(f["lyr1.shape"], "POINT (2.5 48.5)")
+                ogrtest.check_feature_geometry(f["lyr2.another_shape"], "POINT (2 49)")
                 f = sql_lyr.GetNextFeature()
                 if f is not None:
                     f.DumpReadable()
@@ -4575,7 +4202,10 @@ def test_ogr_wfs_vsimem_wfs200_join(with_and_without_streaming):
 
                 # Empty content returned by server
                 with gdaltest.tempfile(
-                    "/vsimem/wfs200_endpoint_join?SERVICE=WFS&VERSION=2.0.0&REQUEST=GetFeature&TYPENAMES=%28lyr1,lyr2%29&FILTER=%3CFilter%20xmlns%3D%22http:%2F%2Fwww.opengis.net%2Ffes%2F2.0%22%20xmlns:gml%3D%22http:%2F%2Fwww.opengis.net%2Fgml%2F3.2%22%3E%3CPropertyIsEqualTo%3E%3CValueReference%3Elyr1%2Fstr%3C%2FValueReference%3E%3CValueReference%3Elyr2%2Fstr2%3C%2FValueReference%3E%3C%2FPropertyIsEqualTo%3E%3C%2FFilter%3E&RESULTTYPE=hits",
+                    _wfs200_join_getfeature
+                    + "&FILTER="
+                    + _wfs200_join_filter
+                    + "&RESULTTYPE=hits",
                     """""",
                 ):
                     with gdal.quiet_errors():
@@ -4584,7 +4214,10 @@ def test_ogr_wfs_vsimem_wfs200_join(with_and_without_streaming):
 
                 # Invalid XML
                 with gdaltest.tempfile(
-                    "/vsimem/wfs200_endpoint_join?SERVICE=WFS&VERSION=2.0.0&REQUEST=GetFeature&TYPENAMES=%28lyr1,lyr2%29&FILTER=%3CFilter%20xmlns%3D%22http:%2F%2Fwww.opengis.net%2Ffes%2F2.0%22%20xmlns:gml%3D%22http:%2F%2Fwww.opengis.net%2Fgml%2F3.2%22%3E%3CPropertyIsEqualTo%3E%3CValueReference%3Elyr1%2Fstr%3C%2FValueReference%3E%3CValueReference%3Elyr2%2Fstr2%3C%2FValueReference%3E%3C%2FPropertyIsEqualTo%3E%3C%2FFilter%3E&RESULTTYPE=hits",
+                    _wfs200_join_getfeature
+                    + "&FILTER="
+                    + _wfs200_join_filter
+                    + "&RESULTTYPE=hits",
                     """<invalid_xml""",
                 ):
                     with gdal.quiet_errors():
@@ -4593,7 +4226,10 @@ def test_ogr_wfs_vsimem_wfs200_join(with_and_without_streaming):
 
                 # Server exception
                 with gdaltest.tempfile(
-                    "/vsimem/wfs200_endpoint_join?SERVICE=WFS&VERSION=2.0.0&REQUEST=GetFeature&TYPENAMES=%28lyr1,lyr2%29&FILTER=%3CFilter%20xmlns%3D%22http:%2F%2Fwww.opengis.net%2Ffes%2F2.0%22%20xmlns:gml%3D%22http:%2F%2Fwww.opengis.net%2Fgml%2F3.2%22%3E%3CPropertyIsEqualTo%3E%3CValueReference%3Elyr1%2Fstr%3C%2FValueReference%3E%3CValueReference%3Elyr2%2Fstr2%3C%2FValueReference%3E%3C%2FPropertyIsEqualTo%3E%3C%2FFilter%3E&RESULTTYPE=hits",
+                    _wfs200_join_getfeature
+                    + "&FILTER="
+                    + _wfs200_join_filter
+                    + "&RESULTTYPE=hits",
                     """<ServiceExceptionReport/>""",
                 ):
                     with gdal.quiet_errors():
@@ -4602,7 +4238,10 @@ def test_ogr_wfs_vsimem_wfs200_join(with_and_without_streaming):
 
                 # Missing FeatureCollection
                 with gdaltest.tempfile(
-                    "/vsimem/wfs200_endpoint_join?SERVICE=WFS&VERSION=2.0.0&REQUEST=GetFeature&TYPENAMES=%28lyr1,lyr2%29&FILTER=%3CFilter%20xmlns%3D%22http:%2F%2Fwww.opengis.net%2Ffes%2F2.0%22%20xmlns:gml%3D%22http:%2F%2Fwww.opengis.net%2Fgml%2F3.2%22%3E%3CPropertyIsEqualTo%3E%3CValueReference%3Elyr1%2Fstr%3C%2FValueReference%3E%3CValueReference%3Elyr2%2Fstr2%3C%2FValueReference%3E%3C%2FPropertyIsEqualTo%3E%3C%2FFilter%3E&RESULTTYPE=hits",
+                    _wfs200_join_getfeature
+                    + "&FILTER="
+                    + _wfs200_join_filter
+                    + "&RESULTTYPE=hits",
                     """<dummy_xml/>""",
                 ):
                     with gdal.quiet_errors():
@@ -4611,7 +4250,10 @@ def test_ogr_wfs_vsimem_wfs200_join(with_and_without_streaming):
 
                 # Missing FeatureCollection.numberMatched
                 with gdaltest.tempfile(
-                    "/vsimem/wfs200_endpoint_join?SERVICE=WFS&VERSION=2.0.0&REQUEST=GetFeature&TYPENAMES=%28lyr1,lyr2%29&FILTER=%3CFilter%20xmlns%3D%22http:%2F%2Fwww.opengis.net%2Ffes%2F2.0%22%20xmlns:gml%3D%22http:%2F%2Fwww.opengis.net%2Fgml%2F3.2%22%3E%3CPropertyIsEqualTo%3E%3CValueReference%3Elyr1%2Fstr%3C%2FValueReference%3E%3CValueReference%3Elyr2%2Fstr2%3C%2FValueReference%3E%3C%2FPropertyIsEqualTo%3E%3C%2FFilter%3E&RESULTTYPE=hits",
+                    _wfs200_join_getfeature
+                    + "&FILTER="
+                    + _wfs200_join_filter
+                    + "&RESULTTYPE=hits",
                     """<FeatureCollection/>""",
                 ):
                     with gdal.quiet_errors():
@@ -4620,7 +4262,10 @@ def test_ogr_wfs_vsimem_wfs200_join(with_and_without_streaming):
 
                 # Valid
                 with gdaltest.tempfile(
-                    "/vsimem/wfs200_endpoint_join?SERVICE=WFS&VERSION=2.0.0&REQUEST=GetFeature&TYPENAMES=%28lyr1,lyr2%29&FILTER=%3CFilter%20xmlns%3D%22http:%2F%2Fwww.opengis.net%2Ffes%2F2.0%22%20xmlns:gml%3D%22http:%2F%2Fwww.opengis.net%2Fgml%2F3.2%22%3E%3CPropertyIsEqualTo%3E%3CValueReference%3Elyr1%2Fstr%3C%2FValueReference%3E%3CValueReference%3Elyr2%2Fstr2%3C%2FValueReference%3E%3C%2FPropertyIsEqualTo%3E%3C%2FFilter%3E&RESULTTYPE=hits",
+                    _wfs200_join_getfeature
+                    + "&FILTER="
+                    + _wfs200_join_filter
+                    + "&RESULTTYPE=hits",
                     """<wfs:FeatureCollection xmlns:xs="http://www.w3.org/2001/XMLSchema"
     xmlns:ogc="http://www.opengis.net/ogc"
     xmlns:foo="http://foo"
@@ -4661,11 +4306,11 @@ def test_ogr_wfs_vsimem_wfs200_join(with_and_without_streaming):
                     or f["lyr1.str"] != "123.4"
                     or f["lyr2.gml_id"] != "lyr2-101"
                     or f["lyr2.str2"] != "123.4"
-                    or f["lyr1.shape"].ExportToWkt() != "POINT (2.5 48.5)"
-                    or f["lyr2.another_shape"].ExportToWkt() != "POINT (2 49)"
                 ):
                     f.DumpReadable()
                     pytest.fail()
+                ogrtest.check_feature_geometry(f["lyr1.shape"], "POINT (2.5 48.5)")
+                ogrtest.check_feature_geometry(f["lyr2.another_shape"], "POINT (2 49)")
 
             ds = ogr.Open("WFS:/vsimem/wfs200_endpoint_join")
             with ds.ExecuteSQL(
@@ -4677,20 +4322,20 @@ def test_ogr_wfs_vsimem_wfs200_join(with_and_without_streaming):
                     or f["my_alias1.str"] != "123.4"
                     or f["lyr2.gml_id"] != "lyr2-101"
                     or f["lyr2.str2"] != "123.4"
-                    or f["my_alias1.shape"].ExportToWkt() != "POINT (2.5 48.5)"
-                    or f["lyr2.another_shape"].ExportToWkt() != "POINT (2 49)"
                 ):
                     f.DumpReadable()
                     pytest.fail()
+                ogrtest.check_feature_geometry(f["my_alias1.shape"], "POINT (2.5 48.5)")
+                ogrtest.check_feature_geometry(f["lyr2.another_shape"], "POINT (2 49)")
 
             ds = ogr.Open("WFS:/vsimem/wfs200_endpoint_join")
             with ds.ExecuteSQL(
                 "SELECT my_alias1.gml_id as gml_id1, "
-                + "CAST(my_alias1.str AS integer) AS str_int, "
-                + "CAST(my_alias1.str AS bigint) AS str_bigint, "
-                + "CAST(my_alias1.str AS float) AS str_float, "
-                + "my_alias1.shape AS myshape "
-                + "FROM lyr1 my_alias1 JOIN lyr2 ON my_alias1.str = lyr2.str2"
+                "CAST(my_alias1.str AS integer) AS str_int, "
+                "CAST(my_alias1.str AS bigint) AS str_bigint, "
+                "CAST(my_alias1.str AS float) AS str_float, "
+                "my_alias1.shape AS myshape "
+                "FROM lyr1 my_alias1 JOIN lyr2 ON my_alias1.str = lyr2.str2"
             ) as sql_lyr:
                 f = sql_lyr.GetNextFeature()
                 if (
@@ -4698,10 +4343,10 @@ def test_ogr_wfs_vsimem_wfs200_join(with_and_without_streaming):
                     or f["str_int"] != 123
                     or f["str_bigint"] != 123
                     or f["str_float"] != 123.4
-                    or f["myshape"].ExportToWkt() != "POINT (2.5 48.5)"
                 ):
                     f.DumpReadable()
                     pytest.fail()
+                ogrtest.check_feature_geometry(f["myshape"], "POINT (2.5 48.5)")
 
             ds = ogr.Open("WFS:/vsimem/wfs200_endpoint_join")
             content = """<?xml version="1.0" encoding="UTF-8"?>
@@ -4735,7 +4380,11 @@ def test_ogr_wfs_vsimem_wfs200_join(with_and_without_streaming):
             with ds.ExecuteSQL(
                 "SELECT * FROM lyr1 JOIN lyr2 ON lyr1.str = lyr2.str2 WHERE lyr2.str2 = '123.4'"
             ) as sql_lyr, gdaltest.tempfile(
-                "/vsimem/wfs200_endpoint_join?SERVICE=WFS&VERSION=2.0.0&REQUEST=GetFeature&TYPENAMES=%28lyr1,lyr2%29&STARTINDEX=0&COUNT=1&FILTER=%3CFilter%20xmlns%3D%22http:%2F%2Fwww.opengis.net%2Ffes%2F2.0%22%20xmlns:gml%3D%22http:%2F%2Fwww.opengis.net%2Fgml%2F3.2%22%3E%3CAnd%3E%3CPropertyIsEqualTo%3E%3CValueReference%3Elyr1%2Fstr%3C%2FValueReference%3E%3CValueReference%3Elyr2%2Fstr2%3C%2FValueReference%3E%3C%2FPropertyIsEqualTo%3E%3CPropertyIsEqualTo%3E%3CValueReference%3Elyr2%2Fstr2%3C%2FValueReference%3E%3CLiteral%3E123.4%3C%2FLiteral%3E%3C%2FPropertyIsEqualTo%3E%3C%2FAnd%3E%3C%2FFilter%3E",
+                _wfs200_join_getfeature
+                + "&STARTINDEX=0&COUNT=1&FILTER="
+                + _urlescape(
+                    '<Filter xmlns="http://www.opengis.net/fes/2.0" xmlns:gml="http://www.opengis.net/gml/3.2"><And><PropertyIsEqualTo><ValueReference>lyr1/str</ValueReference><ValueReference>lyr2/str2</ValueReference></PropertyIsEqualTo><PropertyIsEqualTo><ValueReference>lyr2/str2</ValueReference><Literal>123.4</Literal></PropertyIsEqualTo></And></Filter>'
+                ),
                 content,
             ):
                 f = sql_lyr.GetNextFeature()
@@ -4744,14 +4393,18 @@ def test_ogr_wfs_vsimem_wfs200_join(with_and_without_streaming):
                     or f["lyr1.str"] != "123.4"
                     or f["lyr2.gml_id"] != "lyr2-101"
                     or f["lyr2.str2"] != "123.4"
-                    or f["lyr1.shape"].ExportToWkt() != "POINT (2.5 48.5)"
-                    or f["lyr2.another_shape"].ExportToWkt() != "POINT (2 49)"
                 ):
                     f.DumpReadable()
                     pytest.fail()
+                ogrtest.check_feature_geometry(f["lyr1.shape"], "POINT (2.5 48.5)")
+                ogrtest.check_feature_geometry(f["lyr2.another_shape"], "POINT (2 49)")
 
             with gdaltest.tempfile(
-                "/vsimem/wfs200_endpoint_join?SERVICE=WFS&VERSION=2.0.0&REQUEST=GetFeature&TYPENAMES=%28lyr1,lyr2%29&STARTINDEX=0&COUNT=1&FILTER=%3CFilter%20xmlns%3D%22http:%2F%2Fwww.opengis.net%2Ffes%2F2.0%22%20xmlns:gml%3D%22http:%2F%2Fwww.opengis.net%2Fgml%2F3.2%22%3E%3CAnd%3E%3CPropertyIsEqualTo%3E%3CValueReference%3Elyr1%2Fstr%3C%2FValueReference%3E%3CValueReference%3Elyr2%2Fstr2%3C%2FValueReference%3E%3C%2FPropertyIsEqualTo%3E%3CWithin%3E%3CValueReference%3Elyr2%2Fanother_shape%3C%2FValueReference%3E%3Cgml:Envelope%20srsName%3D%22urn:ogc:def:crs:EPSG::4326%22%3E%3Cgml:lowerCorner%3E%2D90%20%2D180%3C%2Fgml:lowerCorner%3E%3Cgml:upperCorner%3E90%20180%3C%2Fgml:upperCorner%3E%3C%2Fgml:Envelope%3E%3C%2FWithin%3E%3C%2FAnd%3E%3C%2FFilter%3E",
+                _wfs200_join_getfeature
+                + "&STARTINDEX=0&COUNT=1&FILTER="
+                + _urlescape(
+                    '<Filter xmlns="http://www.opengis.net/fes/2.0" xmlns:gml="http://www.opengis.net/gml/3.2"><And><PropertyIsEqualTo><ValueReference>lyr1/str</ValueReference><ValueReference>lyr2/str2</ValueReference></PropertyIsEqualTo><Within><ValueReference>lyr2/another_shape</ValueReference><gml:Envelope srsName="urn:ogc:def:crs:EPSG::4326"><gml:lowerCorner>-90 -180</gml:lowerCorner><gml:upperCorner>90 180</gml:upperCorner></gml:Envelope></Within></And></Filter>'
+                ),
                 content,
             ), ds.ExecuteSQL(
                 "SELECT * FROM lyr1 JOIN lyr2 ON lyr1.str = lyr2.str2 WHERE ST_Within(lyr2.another_shape, ST_MakeEnvelope(-180,-90,180,90))"
@@ -4762,7 +4415,10 @@ def test_ogr_wfs_vsimem_wfs200_join(with_and_without_streaming):
                     pytest.fail()
 
             with gdaltest.tempfile(
-                "/vsimem/wfs200_endpoint_join?SERVICE=WFS&VERSION=2.0.0&REQUEST=GetFeature&TYPENAMES=%28lyr1,lyr2%29&STARTINDEX=0&COUNT=1&FILTER=%3CFilter%20xmlns%3D%22http:%2F%2Fwww.opengis.net%2Ffes%2F2.0%22%20xmlns:gml%3D%22http:%2F%2Fwww.opengis.net%2Fgml%2F3.2%22%3E%3CPropertyIsEqualTo%3E%3CValueReference%3Elyr1%2Fstr%3C%2FValueReference%3E%3CValueReference%3Elyr2%2Fstr2%3C%2FValueReference%3E%3C%2FPropertyIsEqualTo%3E%3C%2FFilter%3E&SORTBY=str%20DESC",
+                _wfs200_join_getfeature
+                + "&STARTINDEX=0&COUNT=1&FILTER="
+                + _wfs200_join_filter
+                + "&SORTBY=str%20DESC",
                 content,
             ), ds.ExecuteSQL(
                 "SELECT * FROM lyr1 JOIN lyr2 ON lyr1.str = lyr2.str2 ORDER BY lyr1.str DESC"
@@ -4772,35 +4428,35 @@ def test_ogr_wfs_vsimem_wfs200_join(with_and_without_streaming):
                     f.DumpReadable()
                     pytest.fail()
 
+            # All three statements are expected to fail, so share one error
+            # handler push/pop.
             with gdal.quiet_errors():
                 sql_lyr = ds.ExecuteSQL(
                     "SELECT * FROM lyr1 JOIN lyr2 ON lyr1.str = lyr2.str2 WHERE lyr1.OGR_GEOMETRY IS NOT NULL"
                 )
-            assert (
-                sql_lyr is None
-                and gdal.GetLastErrorMsg().find("Unsupported WHERE clause") >= 0
-            )
+                assert (
+                    sql_lyr is None
+                    and gdal.GetLastErrorMsg().find("Unsupported WHERE clause") >= 0
+                )
 
-            with gdal.quiet_errors():
                 sql_lyr = ds.ExecuteSQL(
                     "SELECT * FROM lyr1 JOIN lyr2 ON lyr1.OGR_GEOMETRY IS NOT NULL"
                 )
-            assert (
-                sql_lyr is None
-                and gdal.GetLastErrorMsg().find("Unsupported JOIN clause") >= 0
-            )
+                assert (
+                    sql_lyr is None
+                    and gdal.GetLastErrorMsg().find("Unsupported JOIN clause") >= 0
+                )
 
-            with gdal.quiet_errors():
                 sql_lyr = ds.ExecuteSQL(
                     "SELECT 1 FROM lyr1 JOIN lyr2 ON lyr1.str = lyr2.str2"
                 )
-            assert (
-                sql_lyr is None
-                and gdal.GetLastErrorMsg().find(
-                    "Only column names supported in column selection"
+                assert (
+                    sql_lyr is None
+                    and gdal.GetLastErrorMsg().find(
+                        "Only column names supported in column selection"
+                    )
+                    >= 0
                 )
-                >= 0
-            )
 
             ds = None
 
@@ -4808,18 +4464,14 @@ def test_ogr_wfs_vsimem_wfs200_join(with_and_without_streaming):
 ###############################################################################
 
 
-def test_ogr_wfs_vsimem_wfs200_join_layer_with_namespace_prefix(
-    with_and_without_streaming,
-):
-
-    with gdaltest.tempfile(
-        "/vsimem/wfs200_endpoint_join?SERVICE=WFS&REQUEST=GetCapabilities",
-        """<WFS_Capabilities version="2.0.0">
+# GetCapabilities for the namespace-prefixed join endpoint: the two tests
+# using it only differ by the advertised CountDefault.
+_wfs200_join_ns_caps = """<WFS_Capabilities version="2.0.0">
     <OperationsMetadata>
         <ows:Operation name="GetFeature">
             <ows:Constraint name="CountDefault">
                 <ows:NoValues/>
-                <ows:DefaultValue>1</ows:DefaultValue>
+                <ows:DefaultValue>%d</ows:DefaultValue>
             </ows:Constraint>
         </ows:Operation>
         <ows:Constraint name="ImplementsResultPaging">
@@ -4848,37 +4500,22 @@ def test_ogr_wfs_vsimem_wfs200_join_layer_with_namespace_prefix(
         </FeatureType>
     </FeatureTypeList>
 </WFS_Capabilities>
-""",
+"""
+
+
+def test_ogr_wfs_vsimem_wfs200_join_layer_with_namespace_prefix(
+    with_and_without_streaming,
+):
+
+    with gdaltest.tempfile(
+        "/vsimem/wfs200_endpoint_join?SERVICE=WFS&REQUEST=GetCapabilities",
+        _wfs200_join_ns_caps % 1,
     ), gdaltest.tempfile(
         "/vsimem/wfs200_endpoint_join?SERVICE=WFS&VERSION=2.0.0&REQUEST=DescribeFeatureType&TYPENAME=foo:lyr1,foo:lyr2",
-        """<xsd:schema xmlns:foo="http://foo" xmlns:gml="http://www.opengis.net/gml" xmlns:xsd="http://www.w3.org/2001/XMLSchema" elementFormDefault="qualified" targetNamespace="http://foo">
-  <xsd:import namespace="http://www.opengis.net/gml" schemaLocation="http://foo/schemas/gml/3.2.1/base/gml.xsd"/>
-  <xsd:complexType name="lyr1Type">
-    <xsd:complexContent>
-      <xsd:extension base="gml:AbstractFeatureType">
-        <xsd:sequence>
-          <xsd:element maxOccurs="1" minOccurs="0" name="str" nillable="true" type="xsd:string"/>
-          <xsd:element maxOccurs="1" minOccurs="0" name="shape" nillable="true" type="gml:PointPropertyType"/>
-        </xsd:sequence>
-      </xsd:extension>
-    </xsd:complexContent>
-  </xsd:complexType>
-  <xsd:element name="lyr1" substitutionGroup="gml:_Feature" type="foo:lyr1Type"/>
-  <xsd:complexType name="lyr2Type">
-    <xsd:complexContent>
-      <xsd:extension base="gml:AbstractFeatureType">
-        <xsd:sequence>
-          <xsd:element maxOccurs="1" minOccurs="0" name="str2" nillable="true" type="xsd:string"/>
-          <xsd:element maxOccurs="1" minOccurs="0" name="another_shape" nillable="true" type="gml:PointPropertyType"/>
-        </xsd:sequence>
-      </xsd:extension>
-    </xsd:complexContent>
-  </xsd:complexType>
-  <xsd:element name="lyr2" substitutionGroup="gml:_Feature" type="foo:lyr2Type"/>
-</xsd:schema>
-""",
+        _SCHEMA_LYR1_LYR2_XML,
     ), gdaltest.tempfile(
-        "/vsimem/wfs200_endpoint_join?SERVICE=WFS&VERSION=2.0.0&REQUEST=GetFeature&TYPENAMES=%28foo:lyr1,foo:lyr2%29&STARTINDEX=0&COUNT=1&FILTER=%3CFilter%20xmlns%3D%22http:%2F%2Fwww.opengis.net%2Ffes%2F2.0%22%20xmlns:foo%3D%22http:%2F%2Ffoo%22%20xmlns:gml%3D%22http:%2F%2Fwww.opengis.net%2Fgml%2F3.2%22%3E%3CPropertyIsEqualTo%3E%3CValueReference%3Efoo:lyr1%2Fstr%3C%2FValueReference%3E%3CValueReference%3Efoo:lyr2%2Fstr2%3C%2FValueReference%3E%3C%2FPropertyIsEqualTo%3E%3C%2FFilter%3E",
+        "/vsimem/wfs200_endpoint_join?SERVICE=WFS&VERSION=2.0.0&REQUEST=GetFeature&TYPENAMES=%28foo:lyr1,foo:lyr2%29&STARTINDEX=0&COUNT=1&FILTER="
+        + _wfs200_join_filter_ns,
         """<?xml version="1.0" encoding="UTF-8"?>
 <wfs:FeatureCollection xmlns:xs="http://www.w3.org/2001/XMLSchema"
     xmlns:foo="http://foo"
@@ -4918,11 +4555,11 @@ def test_ogr_wfs_vsimem_wfs200_join_layer_with_namespace_prefix(
                 or f["lyr1.str"] != "123.4"
                 or f["lyr2.gml_id"] != "lyr2-101"
                 or f["lyr2.str2"] != "123.4"
-                or f["lyr1.shape"].ExportToWkt() != "POINT (2.5 48.5)"
-                or f["lyr2.another_shape"].ExportToWkt() != "POINT (2 49)"
             ):
                 f.DumpReadable()
                 pytest.fail()
+            ogrtest.check_feature_geometry(f["lyr1.shape"], "POINT (2.5 48.5)")
+            ogrtest.check_feature_geometry(f["lyr2.another_shape"], "POINT (2 49)")
 
 
 ###############################################################################
@@ -4932,41 +4569,7 @@ def test_ogr_wfs_vsimem_wfs200_join_distinct(with_and_without_streaming):
 
     with gdaltest.tempfile(
         "/vsimem/wfs200_endpoint_join?SERVICE=WFS&REQUEST=GetCapabilities",
-        """<WFS_Capabilities version="2.0.0">
-    <OperationsMetadata>
-        <ows:Operation name="GetFeature">
-            <ows:Constraint name="CountDefault">
-                <ows:NoValues/>
-                <ows:DefaultValue>4</ows:DefaultValue>
-            </ows:Constraint>
-        </ows:Operation>
-        <ows:Constraint name="ImplementsResultPaging">
-            <ows:NoValues/><ows:DefaultValue>TRUE</ows:DefaultValue>
-        </ows:Constraint>
-        <ows:Constraint name="ImplementsStandardJoins">
-            <ows:NoValues/><ows:DefaultValue>TRUE</ows:DefaultValue>
-        </ows:Constraint>
-    </OperationsMetadata>
-    <FeatureTypeList>
-        <FeatureType xmlns:foo="http://foo">
-            <Name>foo:lyr1</Name>
-            <DefaultSRS>urn:ogc:def:crs:EPSG::4326</DefaultSRS>
-            <ows:WGS84BoundingBox>
-                <ows:LowerCorner>-180.0 -90.0</ows:LowerCorner>
-                <ows:UpperCorner>180.0 90.0</ows:UpperCorner>
-            </ows:WGS84BoundingBox>
-        </FeatureType>
-        <FeatureType xmlns:foo="http://foo">
-            <Name>foo:lyr2</Name>
-            <DefaultSRS>urn:ogc:def:crs:EPSG::4326</DefaultSRS>
-            <ows:WGS84BoundingBox>
-                <ows:LowerCorner>-180.0 -90.0</ows:LowerCorner>
-                <ows:UpperCorner>180.0 90.0</ows:UpperCorner>
-            </ows:WGS84BoundingBox>
-        </FeatureType>
-    </FeatureTypeList>
-</WFS_Capabilities>
-""",
+        _wfs200_join_ns_caps % 4,
     ), gdaltest.tempfile(
         "/vsimem/wfs200_endpoint_join?SERVICE=WFS&VERSION=2.0.0&REQUEST=DescribeFeatureType&TYPENAME=foo:lyr1,foo:lyr2",
         """<xsd:schema xmlns:foo="http://foo" xmlns:gml="http://www.opengis.net/gml" xmlns:xsd="http://www.w3.org/2001/XMLSchema" elementFormDefault="qualified" targetNamespace="http://foo">
@@ -5001,7 +4604,8 @@ def test_ogr_wfs_vsimem_wfs200_join_distinct(with_and_without_streaming):
 </xsd:schema>
 """,
     ), gdaltest.tempfile(
-        "/vsimem/wfs200_endpoint_join?SERVICE=WFS&VERSION=2.0.0&REQUEST=GetFeature&TYPENAMES=%28foo:lyr1,foo:lyr2%29&STARTINDEX=0&COUNT=4&FILTER=%3CFilter%20xmlns%3D%22http:%2F%2Fwww.opengis.net%2Ffes%2F2.0%22%20xmlns:foo%3D%22http:%2F%2Ffoo%22%20xmlns:gml%3D%22http:%2F%2Fwww.opengis.net%2Fgml%2F3.2%22%3E%3CPropertyIsEqualTo%3E%3CValueReference%3Efoo:lyr1%2Fstr%3C%2FValueReference%3E%3CValueReference%3Efoo:lyr2%2Fstr2%3C%2FValueReference%3E%3C%2FPropertyIsEqualTo%3E%3C%2FFilter%3E",
+        "/vsimem/wfs200_endpoint_join?SERVICE=WFS&VERSION=2.0.0&REQUEST=GetFeature&TYPENAMES=%28foo:lyr1,foo:lyr2%29&STARTINDEX=0&COUNT=4&FILTER="
+        + _wfs200_join_filter_ns,
         """<?xml version="1.0" encoding="UTF-8"?>
 <wfs:FeatureCollection xmlns:xs="http://www.w3.org/2001/XMLSchema"
     xmlns:foo="http://foo"
@@ -5168,9 +4772,7 @@ def test_ogr_wfs_vsimem_wfs200_supported_crs():
 
         assert lyr.SetActiveSRS(0, supported_srs_list[2]) == ogr.OGRERR_NONE
         assert lyr.SetActiveSRS(0, None) != ogr.OGRERR_NONE
-        srs_other = osr.SpatialReference()
-        srs_other.ImportFromEPSG(32632)
-        assert lyr.SetActiveSRS(0, srs_other) != ogr.OGRERR_NONE
+        assert lyr.SetActiveSRS(0, _srs_from_epsg(32632)) != ogr.OGRERR_NONE
 
         getfeatures_response = """<wfs:FeatureCollection xmlns:xs="http://www.w3.org/2001/XMLSchema"
     xmlns:foo="http://foo"
@@ -276,7 +276,9 @@ class CPL_DLL GMLFeatureClass
     int m_nPropertyCount;
     GMLPropertyDefn **m_papoProperty;
     std::map<CPLString, int> m_oMapPropertyNameToIndex{};
-    std::map<CPLString, int> m_oMapPropertySrcElementToIndex{};
+    // Transparent comparator so lookups from the per-element hot path can
+    // pass a std::string_view without materializing a key string.
+    std::map<std::string, int, std::less<>> m_oMapPropertySrcElementToIndex{};
 
     int m_nGeometryPropertyCount;
     GMLGeometryPropertyDefn **m_papoGeometryProperty;
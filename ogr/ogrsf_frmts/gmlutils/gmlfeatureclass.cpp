@@ -20,6 +20,7 @@
 #include <cstdlib>
 #include <cstring>
 #include <string>
+#include <string_view>
 
 #include "cpl_conv.h"
 #include "cpl_error.h"
@@ -133,8 +134,8 @@ int GMLFeatureClass::GetPropertyIndexBySrcElement(const char *pszElement,
                                                   int nLen) const
 
 {
-    auto oIter =
-        m_oMapPropertySrcElementToIndex.find(CPLString(pszElement, nLen));
+    auto oIter = m_oMapPropertySrcElementToIndex.find(
+        std::string_view(pszElement, static_cast<size_t>(nLen)));
     if (oIter != m_oMapPropertySrcElementToIndex.end())
         return oIter->second;
 
@@ -103,6 +103,7 @@ class OGRWFSLayer final : public OGRLayer
 
     bool bInTransaction;
 
+    CPLString m_osPostHeader{};
     CPLString GetPostHeader();
 
     bool bUseFeatureIdAtLayerLevel;
@@ -242,6 +243,10 @@ class OGRWFSJoinLayer final : public OGRLayer
     OGRFeatureDefn *poFeatureDefn;
 
     CPLString osGlobalFilter;
+    // URL-encoded <Filter> document built from osGlobalFilter on first use.
+    // Join layers reject later attribute/spatial filters, so it can be
+    // reused as-is by every paged GetFeature request.
+    CPLString m_osEncodedFilter{};
     CPLString osSortBy;
     int bDistinct;
     std::set<CPLString> aoSetMD5;
@@ -302,6 +307,9 @@ class OGRWFSDataSource final : public GDALDataset
 
     OGRWFSLayer **papoLayers;
     int nLayers;
+    // Exact-name index over papoLayers, so GetLayerIndex() does not scan
+    // the whole layer list on servers advertising many feature types.
+    std::map<std::string, int, std::less<>> m_oMapLayerNameToIdx{};
     std::map<OGRLayer *, OGRLayer *> oMap;
 
     bool bUpdate;
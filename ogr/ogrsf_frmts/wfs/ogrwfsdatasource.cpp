@@ -325,6 +325,10 @@ int OGRWFSDataSource::GetLayerIndex(const char *pszNameIn)
     bool bHasFoundLayerWithColon = false;
 
     /* first a case sensitive check */
+    const auto oIter = m_oMapLayerNameToIdx.find(pszNameIn);
+    if (oIter != m_oMapLayerNameToIdx.end())
+        return oIter->second;
+
     for (int i = 0; i < nLayers; i++)
     {
         OGRWFSLayer *poLayer = papoLayers[i];
@@ -1643,6 +1647,9 @@ int OGRWFSDataSource::Open(const char *pszFilename, int bUpdateIn,
                 papoLayers = (OGRWFSLayer **)CPLRealloc(
                     papoLayers, sizeof(OGRWFSLayer *) * (nLayers + 1));
                 papoLayers[nLayers++] = poLayer;
+                // insert() keeps the first entry on duplicate names, like
+                // the linear scan in GetLayerIndex() would find it.
+                m_oMapLayerNameToIdx.insert({poLayer->GetName(), nLayers - 1});
 
                 if (psFileXML != nullptr)
                 {
@@ -2099,6 +2106,10 @@ CPLString WFS_EscapeURL(const char *pszURL)
     /* colon (:) or comma (,). Causes problems with servers such as
      * http://www.mapinfo.com/miwfs? */
 
+    // Worst case: every byte percent-encoded.
+    osEscapedURL.reserve(3 * strlen(pszURL));
+
+    constexpr char achHexDigits[] = "0123456789ABCDEF";
     for (int i = 0; pszURL[i] != '\0'; i++)
     {
         char ch = pszURL[i];
@@ -2110,10 +2121,10 @@ CPLString WFS_EscapeURL(const char *pszURL)
         }
         else
         {
-            char szPercentEncoded[10];
-            snprintf(szPercentEncoded, sizeof(szPercentEncoded), "%%%02X",
-                     ((unsigned char *)pszURL)[i]);
-            osEscapedURL += szPercentEncoded;
+            const unsigned char byCh = static_cast<unsigned char>(ch);
+            osEscapedURL += '%';
+            osEscapedURL += achHexDigits[byCh >> 4];
+            osEscapedURL += achHexDigits[byCh & 0xF];
         }
     }
 
@@ -363,31 +363,36 @@ CPLString OGRWFSJoinLayer::MakeGetFeatureURL(int bRequestHits)
             CPLURLAddKVP(osURL, "COUNT", CPLSPrintf("%d", nRequestMaxFeatures));
     }
 
-    CPLString osFilter;
-    osFilter = "<Filter xmlns=\"http://www.opengis.net/fes/2.0\"";
-
-    std::map<CPLString, CPLString> oMapNS;
-    for (int i = 0; i < (int)apoLayers.size(); i++)
+    if (m_osEncodedFilter.empty())
     {
-        const char *pszNS = apoLayers[i]->GetNamespacePrefix();
-        const char *pszNSVal = apoLayers[i]->GetNamespaceName();
-        if (pszNS && pszNSVal)
-            oMapNS[pszNS] = pszNSVal;
-    }
-    std::map<CPLString, CPLString>::iterator oIter = oMapNS.begin();
-    for (; oIter != oMapNS.end(); ++oIter)
-    {
-        osFilter += " xmlns:";
-        osFilter += oIter->first;
-        osFilter += "=\"";
-        osFilter += oIter->second;
-        osFilter += "\"";
+        CPLString osFilter;
+        osFilter = "<Filter xmlns=\"http://www.opengis.net/fes/2.0\"";
+
+        std::map<CPLString, CPLString> oMapNS;
+        for (int i = 0; i < (int)apoLayers.size(); i++)
+        {
+            const char *pszNS = apoLayers[i]->GetNamespacePrefix();
+            const char *pszNSVal = apoLayers[i]->GetNamespaceName();
+            if (pszNS && pszNSVal)
+                oMapNS[pszNS] = pszNSVal;
+        }
+        std::map<CPLString, CPLString>::iterator oIter = oMapNS.begin();
+        for (; oIter != oMapNS.end(); ++oIter)
+        {
+            osFilter += " xmlns:";
+            osFilter += oIter->first;
+            osFilter += "=\"";
+            osFilter += oIter->second;
+            osFilter += "\"";
+        }
+        osFilter += " xmlns:gml=\"http://www.opengis.net/gml/3.2\">";
+        osFilter += osGlobalFilter;
+        osFilter += "</Filter>";
+
+        m_osEncodedFilter = WFS_EscapeURL(osFilter);
     }
-    osFilter += " xmlns:gml=\"http://www.opengis.net/gml/3.2\">";
-    osFilter += osGlobalFilter;
-    osFilter += "</Filter>";
 
-    osURL = CPLURLAddKVP(osURL, "FILTER", WFS_EscapeURL(osFilter));
+    osURL = CPLURLAddKVP(osURL, "FILTER", m_osEncodedFilter);
 
     if (bRequestHits)
     {
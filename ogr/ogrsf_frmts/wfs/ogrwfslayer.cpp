@@ -437,6 +437,9 @@ CPLString OGRWFSLayer::MakeGetFeatureURL(int nRequestMaxFeatures,
 
         poFetchedFilterGeom = m_poFilterGeom->clone();
 
+        // A BBOX element with envelope coordinates is ~400 bytes: size the
+        // buffer once instead of reallocating through the += chain below.
+        osGeomFilter.reserve(512);
         osGeomFilter = "<BBOX>";
         if (atoi(poDS->GetVersion()) >= 2)
             osGeomFilter += "<ValueReference>";
@@ -536,6 +539,7 @@ CPLString OGRWFSLayer::MakeGetFeatureURL(int nRequestMaxFeatures,
     if (!osGeomFilter.empty() || !osWFSWhere.empty())
     {
         CPLString osFilter;
+        osFilter.reserve(osWFSWhere.size() + osGeomFilter.size() + 128);
         if (atoi(poDS->GetVersion()) >= 2)
             osFilter = "<Filter xmlns=\"http://www.opengis.net/fes/2.0\"";
         else
@@ -1430,6 +1434,18 @@ OGRErr OGRWFSLayer::SetAttributeFilter(const char *pszFilter)
     if (pszFilter != nullptr && pszFilter[0] == 0)
         pszFilter = nullptr;
 
+    if (pszFilter != nullptr && m_pszAttrQueryString != nullptr &&
+        m_poAttrQuery != nullptr &&
+        strcmp(pszFilter, m_pszAttrQueryString) == 0)
+    {
+        // Same filter as the currently compiled one: recompiling it would
+        // produce the same WFS where clause, so just restart reading.
+        // m_poAttrQuery is checked so that a filter that failed to compile
+        // is not short-circuited to success on a second attempt.
+        ResetReading();
+        return OGRERR_NONE;
+    }
+
     CPLString osOldWFSWhere(osWFSWhere);
 
     CPLFree(m_pszAttrQueryString);
@@ -1870,6 +1886,12 @@ const char *OGRWFSLayer::GetShortName()
 
 CPLString OGRWFSLayer::GetPostHeader()
 {
+    // The header only depends on per-layer constants (WFS version, target
+    // namespace, DescribeFeatureType URL), so build it once and reuse it
+    // for every transaction element.
+    if (!m_osPostHeader.empty())
+        return m_osPostHeader;
+
     CPLString osPost;
     osPost += "<?xml version=\"1.0\"?>\n";
     osPost += "<wfs:Transaction xmlns:wfs=\"http://www.opengis.net/wfs\"\n";
@@ -1895,6 +1917,7 @@ CPLString OGRWFSLayer::GetPostHeader()
 
     osPost += "\">\n";
 
+    m_osPostHeader = osPost;
     return osPost;
 }
 